@@ -7,15 +7,17 @@ API response files in `api/v2/`. It generates:
 - A master all_data.json file
 """
 
-import glob
-import json
+import hashlib
+import itertools
 import os
 import shutil
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
 
 import config
-from config import load_json
+import orjson
+from config import iter_json_files, load_json
 from timeline_utils import build_entity_stat_changes, resolve_entity_id
 from validate_integrity import validate_integrity
 
@@ -24,6 +26,14 @@ VERSION_API = "v2"
 OUTPUT_DIR = config.OUTPUT_DIR
 DATA_DIR = config.DATA_DIR
 
+# Output is compact by default; set BUILD_PRETTY=1 for indent=2 (human-readable) files
+PRETTY = os.environ.get("BUILD_PRETTY") == "1"
+
+# Input fingerprint of the last successful build, kept inside OUTPUT_DIR so it always
+# describes the outputs next to it; set BUILD_FORCE=1 to ignore it
+BUILD_CACHE_FILE = ".build_cache.json"
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
 # Schema to Data Directory Map
 # Output FilenameBase -> Source Directory
 AGGREGATION_MAP = {
@@ -45,7 +55,7 @@ SINGLE_FILES = {
 }
 
 # Timeline Tracking Configuration
-TIMELINE_DIR = os.path.join(config.BASE_DIR, "timeline")
+TIMELINE_DIR = config.TIMELINE_DIR
 TRACKED_FIELDS = {
     "heroes": ["health", "difficulty", "abilities.primary.damage"],
     "units": ["health", "dps", "range", "recharge_time", "attack_interval"],
@@ -61,29 +71,22 @@ def ensure_output_dir():
     Creates the output directory if it does not exist.
     Also cleans up existing generated JSON files to prevent stale data.
     """
-    if not os.path.exists(OUTPUT_DIR):
+    try:
         os.makedirs(OUTPUT_DIR)
         print(f"Created output directory: {OUTPUT_DIR}")
+    except FileExistsError:
+        pass
 
     # Cleanup old files
     # Only delete files we are about to regenerate to preserve patch history
-    # 1. Collection files
-    for key in AGGREGATION_MAP:
-        path = os.path.join(OUTPUT_DIR, f"{key}.json")
-        if os.path.exists(path):
-            os.remove(path)
-
-    # 2. Single files
-    for key in SINGLE_FILES:
-        path = os.path.join(OUTPUT_DIR, f"{key}.json")
-        if os.path.exists(path):
-            os.remove(path)
-
-    # 3. Master & Status
-    for fname in ["all_data.json", "status.json"]:
-        path = os.path.join(OUTPUT_DIR, fname)
-        if os.path.exists(path):
-            os.remove(path)
+    targets = {f"{key}.json" for key in AGGREGATION_MAP}
+    targets.update(f"{key}.json" for key in SINGLE_FILES)
+    targets.update(("all_data.json", "status.json"))
+
+    with os.scandir(OUTPUT_DIR) as it:
+        for entry in it:
+            if entry.name in targets and entry.is_file():
+                os.unlink(entry.path)
 
     print(f"Cleaned up output directory: {OUTPUT_DIR}")
 
@@ -95,17 +98,92 @@ def save_json(filename, data):
     Args:
         filename (str): The name of the file (e.g., 'units.json').
         data (dict | list): The data to serialize.
+
+    Returns:
+        bytes: The serialized payload, so callers can reuse it without re-encoding.
     """
     path = os.path.join(OUTPUT_DIR, filename)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    payload = dump_json(data)
+    _write_bytes(path, payload)
     print(f"[OK] Generated {path} ({len(data)} items)")
+    return payload
+
+
+def submit_save_json(writer, filename, data):
+    """
+    Like save_json, but hands the file write to a thread pool so it overlaps
+    with building the next collection.
+
+    Args:
+        writer (Executor): Pool that performs the write.
+        filename (str): The name of the file (e.g., 'units.json').
+        data (dict | list): The data to serialize.
+
+    Returns:
+        tuple[bytes, Future]: The serialized payload and the pending write.
+            Callers must call result() on the future to surface write errors.
+    """
+    path = os.path.join(OUTPUT_DIR, filename)
+    payload = dump_json(data)
+    future = writer.submit(_write_and_report, path, payload, len(data))
+    return payload, future
+
+
+def _write_and_report(path, payload, count):
+    """Writes an encoded payload, then logs it, so the log line follows the write."""
+    _write_bytes(path, payload)
+    print(f"[OK] Generated {path} ({count} items)")
+
+
+def _write_bytes(path, payload):
+    """Writes an encoded payload to a file."""
+    with open(path, "wb") as f:
+        f.write(payload)
+
+
+def dump_json(data):
+    """
+    Serializes data for an output file, compact unless BUILD_PRETTY=1.
+
+    Args:
+        data (dict | list): The data to serialize.
+
+    Returns:
+        bytes: The encoded JSON.
+    """
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2 if PRETTY else 0)
+
+
+def write_all_data_member(fh, key, payload, first=False):
+    """
+    Appends one `"key": value` member to a streamed all_data.json object.
+    Output matches a single dump_json() of the whole object. In pretty mode the
+    value is re-indented one level, which is safe because JSON strings never
+    contain raw newlines.
+
+    Args:
+        fh (BinaryIO): The open all_data.json file.
+        key (str): The top-level key.
+        payload (bytes): The member value, already serialized by dump_json (e.g. via save_json).
+        first (bool): Whether this is the first member (no leading comma).
+    """
+    if PRETTY:
+        fh.write((b"\n  " if first else b",\n  ") + orjson.dumps(key) + b": " + payload.replace(b"\n", b"\n  "))
+    else:
+        fh.write((b"" if first else b",") + orjson.dumps(key) + b":" + payload)
+
+
+# Escapes `<` only; `>` is intentionally kept for readability / game math
+_LT_TABLE = str.maketrans({"<": "&lt;"})
 
 
 def sanitize_recursive(data):
     """
     Escapes HTML characters in strings to prevent XSS.
-    Uses an iterative approach to handle arbitrarily deep nesting.
+    Uses an iterative approach to handle arbitrarily deep nesting, and rewrites
+    strings in place: dicts and lists are mutated and returned, never copied.
+    Callers pass freshly loaded data, so nothing else observes the mutation.
+    Containers reachable through several references are only walked once.
 
     Args:
         data (dict | list | str | any): The data to sanitize.
@@ -114,94 +192,220 @@ def sanitize_recursive(data):
         The sanitized data structure.
     """
     if isinstance(data, str):
-        return data.replace("<", "&lt;")
-    if not isinstance(data, (dict, list)):
-        return data
+        return data.translate(_LT_TABLE) if "<" in data else data
 
-    # Iterative deep-copy-and-sanitize using a stack
-    if isinstance(data, dict):
-        root = {}
-    else:
-        root = [None] * len(data)
+    stack = [data]
+    seen = set()
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
 
-    # Stack entries: (source_container, key_or_index, dest_container)
-    stack = []
+        if isinstance(node, dict):
+            items = node.items()
+        elif isinstance(node, list):
+            items = enumerate(node)
+        else:
+            continue
 
-    # Seed the stack with top-level items
-    if isinstance(data, dict):
-        for k, v in data.items():
-            stack.append((v, k, root))
-    else:
-        for i, v in enumerate(data):
-            stack.append((v, i, root))
+        for key, value in items:
+            if isinstance(value, str):
+                if "<" in value:
+                    node[key] = value.translate(_LT_TABLE)
+            elif isinstance(value, (dict, list)):
+                stack.append(value)
 
-    while stack:
-        value, key, dest = stack.pop()
-
-        if isinstance(value, str):
-            dest[key] = value.replace("<", "&lt;")
-        elif isinstance(value, dict):
-            new_dict = {}
-            dest[key] = new_dict
-            for k, v in value.items():
-                stack.append((v, k, new_dict))
-        elif isinstance(value, list):
-            new_list = [None] * len(value)
-            dest[key] = new_list
-            for i, v in enumerate(value):
-                stack.append((v, i, new_list))
-        else:
-            dest[key] = value
+    return data
+
+
+def load_sanitized(path):
+    """
+    Loads a data file and escapes `<` in its strings.
+
+    The raw bytes are checked first: a file with no `<` (literal or \\u003c
+    escape) cannot produce one when parsed, so the sanitize walk is skipped.
+
+    Args:
+        path (str): Path to the JSON file.
+
+    Returns:
+        dict | list: The sanitized data, or None if loading failed.
+    """
+    try:
+        raw = config.read_json_bytes(path)
+        data = orjson.loads(raw)
+    except Exception as e:
+        print(f"[ERROR] Invalid JSON in {path}: {e}")
+        return None
 
-    return root
+    if b"<" in raw or b"\\u003c" in raw or b"\\u003C" in raw:
+        data = sanitize_recursive(data)
+    return data
 
 
-def inject_hero_image_urls(entity):
+def _list_json(path):
+    """
+    Lists the .json files directly inside a directory with a single scandir.
+    Returns None if the directory does not exist (distinct from an empty one).
+    """
+    try:
+        with os.scandir(path) as entries:
+            return [e.path for e in entries if e.name.endswith(".json") and not e.name.startswith(".") and e.is_file()]
+    except FileNotFoundError:
+        return None
+
+
+def list_asset_names(*parts):
+    """
+    Lists the filenames in an assets/ subdirectory with a single scandir.
+
+    Args:
+        *parts (str): Path components under assets/ (e.g. "heroes", "abilities").
+
+    Returns:
+        set[str]: Filenames present, or an empty set if the directory is missing.
+    """
+    try:
+        with os.scandir(os.path.join(config.ASSETS_DIR, *parts)) as entries:
+            return {entry.name for entry in entries if entry.is_file()}
+    except FileNotFoundError:
+        return set()
+
+
+def inject_hero_image_urls(entity, hero_assets=None, ability_assets=None):
     """
     Injects root-relative image URLs for hero card and abilities.
     Only includes URLs if the corresponding .webp file exists in assets/.
+
+    The asset name sets can be pre-built once per build with list_asset_names;
+    they are scanned on demand otherwise.
     """
     eid = entity.get("entity_id")
     if not eid:
         return
 
+    if hero_assets is None:
+        hero_assets = list_asset_names("heroes")
+    if ability_assets is None:
+        ability_assets = list_asset_names("heroes", "abilities")
+
     image_urls = {}
 
     # Check card art
-    card_rel_path = f"heroes/{eid}.webp"
-    card_abs_path = os.path.join(config.ASSETS_DIR, card_rel_path.replace("/", os.sep))
-    if os.path.exists(card_abs_path):
-        image_urls["card"] = f"/assets/{card_rel_path}"
+    if f"{eid}.webp" in hero_assets:
+        image_urls["card"] = f"/assets/heroes/{eid}.webp"
 
     # Check abilities
     for ability_type in ["attack", "defense", "passive", "ultimate"]:
-        ability_rel_path = f"heroes/abilities/{eid}_{ability_type}.webp"
-        ability_abs_path = os.path.join(config.ASSETS_DIR, ability_rel_path.replace("/", os.sep))
-        if os.path.exists(ability_abs_path):
-            image_urls[ability_type] = f"/assets/{ability_rel_path}"
+        ability_file = f"{eid}_{ability_type}.webp"
+        if ability_file in ability_assets:
+            image_urls[ability_type] = f"/assets/heroes/abilities/{ability_file}"
 
     if image_urls:
         entity["image_urls"] = image_urls
 
 
-def inject_map_image_url(entity: dict) -> None:
+def inject_map_image_url(entity: dict, map_assets: set[str] | None = None) -> None:
     """
     Injects a root-relative image URL for a map entity.
     Checks assets/maps/{entity_id}.webp first, falls back to .png.
-    Only injects if the file actually exists on disk.
+    Only injects if the file actually exists on disk (or is in `map_assets`, when given).
     """
     eid = entity.get("entity_id")
     if not eid:
         return
 
+    if map_assets is None:
+        map_assets = list_asset_names("maps")
+
     for ext in ("webp", "png"):
-        rel_path = f"maps/{eid}.{ext}"
-        abs_path = os.path.join(config.ASSETS_DIR, rel_path.replace("/", os.sep))
-        if os.path.exists(abs_path):
-            entity["image_urls"] = {"map": f"/assets/{rel_path}"}
+        filename = f"{eid}.{ext}"
+        if filename in map_assets:
+            entity["image_urls"] = {"map": f"/assets/maps/{filename}"}
             return
 
 
+def compute_build_fingerprint():
+    """
+    Hashes everything the build reads: data files, root changelog/audit files,
+    timeline snapshots, asset names, the builder's own sources and output settings.
+    Files are represented by (path, mtime_ns, size), so nothing is read.
+
+    Returns:
+        str: Hex digest identifying the current set of inputs.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(f"{VERSION_API}|{OUTPUT_DIR}|{PRETTY}\n".encode())
+
+    paths = list(iter_json_files(DATA_DIR))
+    paths.extend(iter_json_files(os.path.join(config.BASE_DIR, config.PATCH_HISTORY_DIR), suffix=""))
+    paths.extend(_list_json(config.BASE_DIR) or [])
+    paths.extend(os.path.join(SCRIPTS_DIR, name) for name in ("build_api.py", "config.py", "timeline_utils.py"))
+    for path in sorted(paths):
+        st = os.stat(path)
+        hasher.update(f"{path}|{st.st_mtime_ns}|{st.st_size}\n".encode())
+
+    for parts in (("heroes",), ("heroes", "abilities"), ("maps",)):
+        hasher.update("|".join(sorted(list_asset_names(*parts))).encode() + b"\n")
+
+    return hasher.hexdigest()
+
+
+def _output_stamps():
+    """
+    Returns {relative path: [mtime_ns, size]} for every file under the output
+    directory (collections, status.json, changelog pages, timeline, ...), or
+    None if the directory is missing. The build cache file itself is left out.
+    """
+    if not os.path.isdir(OUTPUT_DIR):
+        return None
+    stamps = {}
+    for root, _, files in os.walk(OUTPUT_DIR):
+        for name in files:
+            path = os.path.join(root, name)
+            relpath = os.path.relpath(path, OUTPUT_DIR)
+            if relpath == BUILD_CACHE_FILE:
+                continue
+            st = os.stat(path)
+            stamps[relpath] = [st.st_mtime_ns, st.st_size]
+    return stamps
+
+
+def build_is_current(fingerprint):
+    """
+    Checks whether the last successful build used the same inputs and none of
+    its outputs has been deleted, added or touched since.
+
+    Args:
+        fingerprint (str): Result of compute_build_fingerprint().
+
+    Returns:
+        bool: True if the build can be skipped.
+    """
+    if os.environ.get("BUILD_FORCE") == "1":
+        return False
+    try:
+        with open(os.path.join(OUTPUT_DIR, BUILD_CACHE_FILE), "rb") as f:
+            cached = orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return False
+    if not isinstance(cached, dict) or cached.get("fingerprint") != fingerprint:
+        return False
+
+    stamps = _output_stamps()
+    return bool(stamps) and cached.get("outputs") == stamps
+
+
+def save_build_cache(fingerprint):
+    """Records the fingerprint of a successful build alongside stamps of every output it wrote."""
+    try:
+        with open(os.path.join(OUTPUT_DIR, BUILD_CACHE_FILE), "wb") as f:
+            f.write(orjson.dumps({"fingerprint": fingerprint, "outputs": _output_stamps()}))
+    except OSError as e:
+        print(f"[WARN] Could not save build cache: {e}")
+
+
 def main():
     print(f"Building API {VERSION_API}...")
 
@@ -213,6 +417,11 @@ def main():
             print("[FATAL] Validation failed. Build aborted.")
             sys.exit(1)
 
+    fingerprint = compute_build_fingerprint()
+    if build_is_current(fingerprint):
+        print("[OK] Inputs unchanged since the last build; skipping (set BUILD_FORCE=1 to rebuild).")
+        return
+
     ensure_output_dir()
 
     # Load Game Config for Version
@@ -220,66 +429,104 @@ def main():
     game_config = load_json(game_config_path)
     version = game_config.get("version", "0.0.1") if game_config else "0.0.1"
 
-    all_data = {"build_info": {"version": version, "generated_at": datetime.now(UTC).isoformat()}}
+    # One timestamp per run, shared by build_info and status.json
+    generated_at = datetime.now(UTC).isoformat()
+    build_info = {"version": version, "generated_at": generated_at}
 
     errors = 0
 
-    # Aggregate Collections
-    for key, folder in AGGREGATION_MAP.items():
-        print(f"Aggregating {key} from data/{folder}...")
-        collection = []
-        source_path = os.path.join(DATA_DIR, folder)
-
-        if not os.path.exists(source_path):
-            print(f"[WARN] Directory not found: {source_path}")
-            all_data[key] = []
-            # Not a critical error, just a warning
-            continue
-
-        files = glob.glob(os.path.join(source_path, "*.json"))
-        for file in files:
-            content = load_json(file)
-            if content is not None:
-                content = sanitize_recursive(content)
-                collection.append(content)
-            else:
-                errors += 1
-
-        # Inject stat changes from timeline
-        tracked_fields = TRACKED_FIELDS.get(key, [])
-        for entity in collection:
-            eid = resolve_entity_id(entity)
-            if eid:
-                changes = build_entity_stat_changes(eid, TIMELINE_DIR, tracked_fields)
+    # Index asset directories once instead of probing per entity
+    hero_assets = list_asset_names("heroes")
+    ability_assets = list_asset_names("heroes", "abilities")
+    map_assets = list_asset_names("maps")
+
+    # all_data.json is streamed member-by-member so each collection can be
+    # released once written, instead of holding the full aggregate in memory.
+    all_data_path = os.path.join(OUTPUT_DIR, "all_data.json")
+    # File loads are I/O-bound; a thread pool overlaps the open/read syscalls.
+    # Collection files are written on a separate pool so they don't queue behind loads.
+    writes = []
+    with (
+        open(all_data_path, "wb") as all_data_file,
+        ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as pool,
+        ThreadPoolExecutor(max_workers=4) as writer,
+    ):
+        all_data_file.write(b"{")
+        write_all_data_member(all_data_file, "build_info", dump_json(build_info), first=True)
+        member_count = 1
+
+        # Discover every collection's files up front and submit them as one pool
+        # pass, so later folders load while earlier collections are processed.
+        # map() yields in submission order, so each collection keeps its file order.
+        folder_files = {key: _list_json(os.path.join(DATA_DIR, folder)) for key, folder in AGGREGATION_MAP.items()}
+        loaded = pool.map(load_sanitized, [path for files in folder_files.values() if files for path in files])
+
+        # Aggregate Collections
+        for key, folder in AGGREGATION_MAP.items():
+            print(f"Aggregating {key} from data/{folder}...")
+            collection = []
+            source_path = os.path.join(DATA_DIR, folder)
+            files = folder_files[key]
+
+            if files is None:
+                print(f"[WARN] Directory not found: {source_path}")
+                write_all_data_member(all_data_file, key, b"[]")
+                member_count += 1
+                # Not a critical error, just a warning
+                continue
+
+            for content in itertools.islice(loaded, len(files)):
+                if content is not None:
+                    collection.append(content)
+                else:
+                    errors += 1
+
+            # Inject stat changes from timeline; each entity's timeline is an independent file
+            tracked_fields = TRACKED_FIELDS.get(key, [])
+            identified = [(entity, eid) for entity in collection if (eid := resolve_entity_id(entity))]
+            stat_changes = pool.map(
+                build_entity_stat_changes,
+                [eid for _, eid in identified],
+                itertools.repeat(TIMELINE_DIR),
+                itertools.repeat(tracked_fields),
+            )
+            for (entity, _), changes in zip(identified, stat_changes, strict=True):
                 if changes:
                     entity["stat_changes"] = changes
 
-            if key == "heroes":
-                inject_hero_image_urls(entity)
-            elif key == "map_chests":
-                inject_map_image_url(entity)
-
-        # Save individual aggregation
-        save_json(f"{key}.json", collection)
-        all_data[key] = collection
-
-    # Process Single Files
-    for key, filename in SINGLE_FILES.items():
-        print(f"Processing {key}...")
-        path = os.path.join(DATA_DIR, filename)
-        if os.path.exists(path):
-            content = load_json(path)
-            if content is not None:
-                content = sanitize_recursive(content)
-                save_json(f"{key}.json", content)
-                all_data[key] = content
+            for entity in collection:
+                if key == "heroes":
+                    inject_hero_image_urls(entity, hero_assets, ability_assets)
+                elif key == "map_chests":
+                    inject_map_image_url(entity, map_assets)
+
+            # Save individual aggregation; the same bytes are spliced into all_data.json
+            payload, write = submit_save_json(writer, f"{key}.json", collection)
+            writes.append(write)
+            write_all_data_member(all_data_file, key, payload)
+            member_count += 1
+
+        # Process Single Files
+        for key, filename in SINGLE_FILES.items():
+            print(f"Processing {key}...")
+            path = os.path.join(DATA_DIR, filename)
+            if os.path.exists(path):
+                content = load_sanitized(path)
+                if content is not None:
+                    payload, write = submit_save_json(writer, f"{key}.json", content)
+                    writes.append(write)
+                    write_all_data_member(all_data_file, key, payload)
+                    member_count += 1
+                else:
+                    errors += 1
             else:
-                errors += 1
-        else:
-            print(f"[WARN] File not found: {path}")
+                print(f"[WARN] File not found: {path}")
 
-    # Save Master File
-    save_json("all_data.json", all_data)
+        all_data_file.write(b"\n}" if PRETTY else b"}")
+
+        for write in writes:
+            write.result()
+    print(f"[OK] Generated {all_data_path} ({member_count} items)")
 
     if errors > 0:
         print(f"[FAIL] Build failed with {errors} errors.")
@@ -295,77 +542,110 @@ def main():
         "min_client_version": "0.0.0",
         "upgrade_required": False,
         "message": "Development Server Online",
-        "generated_at": datetime.now(UTC).isoformat(),
+        "generated_at": generated_at,
     }
     save_json("status.json", status_data)
 
     # Build Patch History Endpoints
     build_patch_history()
 
+    save_build_cache(fingerprint)
     print("Build Complete.")
 
 
+def _copy_many(jobs):
+    """
+    Copies files concurrently on a thread pool (the work is I/O-bound),
+    carrying over each source's timestamps.
+
+    Args:
+        jobs (list): (src, dst, stat_result or None) tuples.
+
+    Returns:
+        int: Number of files copied.
+    """
+    if not jobs:
+        return 0
+
+    def copy_one(job):
+        src, dst, st = job
+        if st is None:
+            st = os.stat(src)
+        shutil.copyfile(src, dst)
+        os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    with ThreadPoolExecutor(max_workers=min(16, len(jobs))) as pool:
+        # Consume the iterator so copy errors propagate here
+        for _ in pool.map(copy_one, jobs):
+            pass
+    return len(jobs)
+
+
 def build_patch_history():
     """
     Copies changelog files and timeline snapshots from the project root
     into the API output directory so they are served as endpoints.
     """
     print("Building patch history endpoints...")
-    copied = 0
+    jobs = []
+    copied_names = []
 
     # 1. Copy changelog JSON files (e.g. changelog_index.json, changelog.json, changelog_latest.json)
     for filename in config.PATCH_HISTORY_FILES:
         src = os.path.join(config.BASE_DIR, filename)
         dst = os.path.join(OUTPUT_DIR, filename)
-        if os.path.exists(src):
-            shutil.copy2(src, dst)
-            print(f"[OK] Copied {filename} -> {OUTPUT_DIR}")
-            copied += 1
-        else:
+        try:
+            jobs.append((src, dst, os.stat(src)))
+            copied_names.append(filename)
+        except FileNotFoundError:
             print(f"[WARN] Patch file not found: {src}")
 
     # 1a. Copy audit log
     audit_src = os.path.join(config.BASE_DIR, "audit.json")
     audit_dst = os.path.join(OUTPUT_DIR, "audit.json")
-    if os.path.exists(audit_src):
-        shutil.copy2(audit_src, audit_dst)
-        print(f"[OK] Copied audit.json -> {OUTPUT_DIR}")
-        copied += 1
-    else:
+    try:
+        jobs.append((audit_src, audit_dst, os.stat(audit_src)))
+        copied_names.append("audit.json")
+    except FileNotFoundError:
         print("[WARN] audit.json not found at project root (run build_audit_log.py first)")
 
     # 1b. Copy paginated changelog pages (changelog_page_*.json)
-    for page_file in glob.glob(os.path.join(config.BASE_DIR, "changelog_page_*.json")):
+    for page_file in _list_json(config.BASE_DIR) or []:
         filename = os.path.basename(page_file)
-        dst = os.path.join(OUTPUT_DIR, filename)
-        shutil.copy2(page_file, dst)
-        print(f"[OK] Copied {filename} -> {OUTPUT_DIR}")
-        copied += 1
+        if not filename.startswith("changelog_page_"):
+            continue
+        jobs.append((page_file, os.path.join(OUTPUT_DIR, filename), None))
+        copied_names.append(filename)
 
     # 2. Copy timeline directory
     src_timeline = os.path.join(config.BASE_DIR, config.PATCH_HISTORY_DIR)
     dst_timeline = os.path.join(OUTPUT_DIR, config.PATCH_HISTORY_DIR)
+    file_count = None
 
-    if os.path.isdir(src_timeline):
+    try:
+        entries = list(os.scandir(src_timeline))
+    except (FileNotFoundError, NotADirectoryError):
+        print(f"[WARN] Timeline directory not found: {src_timeline}")
+    else:
         # Clean stale files then ensure destination exists
-        if os.path.isdir(dst_timeline):
-            for stale in glob.glob(os.path.join(dst_timeline, "*.json")):
-                os.remove(stale)
+        for stale in _list_json(dst_timeline) or []:
+            os.remove(stale)
         os.makedirs(dst_timeline, exist_ok=True)
 
-        for entry in os.listdir(src_timeline):
-            if entry.startswith("."):
+        file_count = 0
+        for entry in entries:
+            if entry.name.startswith("."):
                 continue  # skip dotfiles like .gitkeep
-            src_file = os.path.join(src_timeline, entry)
-            dst_file = os.path.join(dst_timeline, entry)
-            if os.path.isfile(src_file):
-                shutil.copy2(src_file, dst_file)
-                copied += 1
+            file_count += 1
+            if entry.is_file():
+                jobs.append((entry.path, os.path.join(dst_timeline, entry.name), entry.stat()))
 
-        file_count = len([f for f in os.listdir(src_timeline) if not f.startswith(".")])
+    copied = _copy_many(jobs)
+
+    for filename in copied_names:
+        print(f"[OK] Copied {filename} -> {OUTPUT_DIR}")
+    if file_count is not None:
         print(f"[OK] Copied {file_count} timeline snapshots -> {dst_timeline}")
-    else:
-        print(f"[WARN] Timeline directory not found: {src_timeline}")
 
     print(f"Patch history: {copied} files copied.")
 
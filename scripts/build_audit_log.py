@@ -1,9 +1,12 @@
-import json
+import contextlib
+import itertools
 import os
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 
 import config
-from patch_utils import compute_diff, get_file_content_at_commit
+import orjson
+from patch_utils import batch_reader, compute_diff, get_blob_content, get_file_content_at_commit
 
 # Strict exclusion list for data files that aren't "entities"
 EXCLUDED_FILES = {
@@ -16,29 +19,57 @@ EXCLUDED_FILES = {
     "data/changelog_latest.json",
 }
 
+# Bump whenever _diff_one or compute_diff changes what an entry contains, so entries
+# cached in an existing audit.json are recomputed instead of reused
+AUDIT_FORMAT_VERSION = 1
+
 
 def is_entity_file(filepath):
     if not filepath.startswith("data/"):
         return False
     if not filepath.endswith(".json"):
         return False
-    if filepath.replace("\\", "/") in EXCLUDED_FILES:
+    normalized = filepath.replace("\\", "/")
+    if normalized in EXCLUDED_FILES:
         return False
 
     # Must be in a category folder, like data/units/ogre.json
-    parts = filepath.replace("\\", "/").split("/")
+    parts = normalized.split("/")
     if len(parts) < 3:
         return False
     return True
 
 
-def parse_git_log():
+def parse_git_log(since=None, max_commits=None):
     """
     Runs git log to get all commits touching the data/ folder, newest first.
+
+    Args:
+        since (str, optional): Only list commits newer than this date (git --since syntax).
+        max_commits (int, optional): Only list the newest N data commits.
+
     Returns a list of commit dicts:
-    [{'commit': hash, 'timestamp': ts, 'author': name, 'message': msg, 'files': [(status, path), ...]}, ...]
+    [{'commit': hash, 'timestamp': ts, 'author': name, 'message': msg, 'files': [(status, path), ...],
+      'blobs': {path: (old_blob_sha, new_blob_sha)}}, ...]
     """
-    cmd = ["git", "log", "--no-merges", "--name-status", "--format=COMMIT|%H|%aI|%aN|%s", "--", "data/"]
+    # --no-renames skips git's similarity scan; a rename is reported as a delete plus an add.
+    # --raw reports each file's before/after blob SHAs, so contents can be read directly
+    # instead of resolving "<commit>~1:<path>" (which fails for a repository's first commit).
+    cmd = [
+        "git",
+        "log",
+        "--no-merges",
+        "--no-renames",
+        "--diff-filter=AMD",
+        "--raw",
+        "--no-abbrev",
+        "--format=COMMIT|%H|%aI|%aN|%s",
+    ]
+    if since:
+        cmd.append(f"--since={since}")
+    if max_commits:
+        cmd.append(f"--max-count={int(max_commits)}")
+    cmd += ["--", "data/"]
     try:
         process = subprocess.run(cmd, capture_output=True, text=True, check=True, cwd=config.BASE_DIR)
         output = process.stdout
@@ -63,94 +94,233 @@ def parse_git_log():
                     "author": parts[3],
                     "message": parts[4],
                     "files": [],
+                    "blobs": {},
                 }
                 commits.append(current_commit)
-        elif current_commit:
-            # File status line, e.g. "M\tdata/units/ogre.json"
-            parts = line.split("\t")
-            if len(parts) >= 2:
-                status = parts[0]
-                filepath = parts[-1]  # Renames have 3 parts (status, old, new), we just want the latest path
-                if is_entity_file(filepath):
-                    current_commit["files"].append((status, filepath))
+        elif current_commit and line.startswith(":"):
+            # Raw line, e.g. ":100644 100644 <old_sha> <new_sha> M\tdata/units/ogre.json"
+            meta, _, filepath = line.partition("\t")
+            fields = meta.split()
+            if len(fields) >= 5 and is_entity_file(filepath):
+                current_commit["files"].append((fields[4], filepath))
+                current_commit["blobs"][filepath] = (fields[2], fields[3])
 
     # Filter out commits that only touched excluded files (files list is empty)
     return [c for c in commits if c["files"]]
 
 
-def build_audit_log():
-    print("Building commit-level audit log...")
-    commits = parse_git_log()
-    print(f"Found {len(commits)} data commits to process.")
+def _diff_one(task):
+    """
+    Fetches the before/after content of one changed file and diffs it.
+
+    Args:
+        task (tuple): (commit_hash, status, filepath, blobs) from parse_git_log, where
+            blobs is the (old, new) blob SHA pair or None when the log did not report it.
+
+    Returns:
+        dict | None: The change entry, or None if the file produced no change.
+    """
+    commit_hash, status, filepath, blobs = task
+    status_char = status[0].upper()
+
+    if blobs is not None:
+        old_blob, new_blob = blobs
+
+        def fetch_old():
+            return get_blob_content(old_blob)
+
+        def fetch_new():
+            return get_blob_content(new_blob)
+    else:
+
+        def fetch_old():
+            return get_file_content_at_commit(filepath, f"{commit_hash}~1")
+
+        def fetch_new():
+            return get_file_content_at_commit(filepath, commit_hash)
+
+    # Extract category and entity
+    # parse_git_log only yields "data/<category>/.../<entity>.json" paths
+    parts = filepath.split("/")
+    category = parts[1]
+    entity_id = parts[-1][: -len(".json")]
+
+    # Fetch old and new data
+    if status_char == "A":
+        # Added file, no old data
+        old_data = None
+        new_data = fetch_new()
+        change_type = "add"
+    elif status_char == "D":
+        # Deleted file, no new data
+        old_data = fetch_old()
+        new_data = None
+        change_type = "delete"
+    else:
+        # Modified, need both. Without blob SHAs this falls back to the
+        # parent ~1, which fails (returns None) for a repository's first commit.
+        old_data = fetch_old()
+        new_data = fetch_new()
+        change_type = "edit"
+
+    # If both are None, skip (maybe file deletion was actually a folder or corrupted json)
+    if old_data is None and new_data is None:
+        return None
+
+    # Compute granular diff
+    diffs = compute_diff(old_data, new_data)
+
+    if diffs or change_type in ("add", "delete"):
+        return {
+            "entity_id": entity_id,
+            "file": filepath,
+            "category": category,
+            "change_type": change_type,
+            "diffs": diffs,
+        }
+    return None
+
+
+def load_existing_entries(path, meta_path):
+    """
+    Loads a previously generated audit.json, keyed by commit hash.
+    Commits are immutable, so their entries can be reused as-is, but only when the
+    sidecar at meta_path shows they were produced by the current AUDIT_FORMAT_VERSION.
+    Set AUDIT_FORCE=1 to ignore the existing files and recompute everything.
 
-    audit_entries = []
+    Args:
+        path (str): Path to audit.json.
+        meta_path (str): Path to the sidecar written by save_audit_meta.
 
+    Returns:
+        tuple[dict, set]: ({commit_hash: audit_entry}, hashes of commits that produced no
+            entity changes). Both are empty if either file is missing, unreadable or stale.
+    """
+    if os.environ.get("AUDIT_FORCE") == "1":
+        return {}, set()
+    try:
+        with open(meta_path, "rb") as f:
+            meta = orjson.loads(f.read())
+        if meta.get("version") != AUDIT_FORMAT_VERSION:
+            return {}, set()
+        with open(path, "rb") as f:
+            entries = orjson.loads(f.read())
+        return {entry["commit"]: entry for entry in entries}, set(meta.get("empty_commits", []))
+    except (OSError, ValueError, TypeError, KeyError, AttributeError):
+        return {}, set()
+
+
+def save_audit_meta(meta_path, empty_commits):
+    """
+    Records the format version audit.json was built with, plus the commits that
+    produced no entity changes so later runs skip them too.
+
+    Args:
+        meta_path (str): Path to the sidecar file.
+        empty_commits (set): Hashes of commits with no entity changes.
+    """
+    meta = {"version": AUDIT_FORMAT_VERSION, "empty_commits": sorted(empty_commits)}
+    with open(meta_path, "wb") as f:
+        f.write(orjson.dumps(meta, option=orjson.OPT_INDENT_2))
+        f.write(b"\n")
+
+
+def _iter_audit_entries(commits, existing, empty, results):
+    """
+    Yields audit entries newest first, reusing cached entries where available.
+
+    Args:
+        commits (list): Commit dicts from parse_git_log.
+        existing (dict): Previously generated entries keyed by commit hash.
+        empty (set): Hashes of commits known to have no entity changes. Newly
+            diffed commits without changes are added to it.
+        results (iterator): _diff_one results for the pending commits' files, in order.
+    """
     for c in commits:
-        commit_hash = c["commit"]
-        changes = []
-
-        for status, filepath in c["files"]:
-            status_char = status[0].upper()
-
-            # Extract category and entity
-            parts = filepath.split("/")
-            category = parts[1]
-            entity_id = os.path.splitext(os.path.basename(filepath))[0]
-
-            # Fetch old and new data
-            if status_char == "A":
-                # Added file, no old data
-                old_data = None
-                new_data = get_file_content_at_commit(filepath, commit_hash)
-                change_type = "add"
-            elif status_char == "D":
-                # Deleted file, no new data
-                old_data = get_file_content_at_commit(filepath, f"{commit_hash}~1")
-                new_data = None
-                change_type = "delete"
-            else:
-                # Modified or Renamed, need both (using robust parent ~1)
-                # Note: If this modifies a file in the FIRST commit of a repo, ~1 will fail,
-                # get_file_content_at_commit swallows the error and returns None.
-                old_data = get_file_content_at_commit(filepath, f"{commit_hash}~1")
-                new_data = get_file_content_at_commit(filepath, commit_hash)
-                change_type = "edit" if status_char == "M" else "rename"
-
-            # If both are None, skip (maybe file deletion was actually a folder or corrupted json)
-            if old_data is None and new_data is None:
-                continue
-
-            # Compute granular diff
-            diffs = compute_diff(old_data, new_data)
-
-            if diffs or change_type in ("add", "delete"):
-                changes.append(
-                    {
-                        "entity_id": entity_id,
-                        "file": filepath,
-                        "category": category,
-                        "change_type": change_type,
-                        "diffs": diffs,
-                    }
-                )
+        if c["commit"] in existing:
+            yield existing[c["commit"]]
+            continue
+        if c["commit"] in empty:
+            continue
+
+        # map() yields in task order, so each commit takes exactly its own files' results
+        changes = [change for change in itertools.islice(results, len(c["files"])) if change]
 
         # Only add the commit to the audit log if there are actual entity changes
         if changes:
-            entry = {
-                "commit": commit_hash,
+            yield {
+                "commit": c["commit"],
                 "timestamp": c["timestamp"],
                 "author": c["author"],
                 "message": c["message"],
                 "changes": changes,
             }
-            audit_entries.append(entry)
+        else:
+            empty.add(c["commit"])
+
+
+def build_audit_log():
+    print("Building commit-level audit log...")
+    # AUDIT_SINCE / AUDIT_MAX_COMMITS bound the git history walk (e.g. in CI)
+    since = os.environ.get("AUDIT_SINCE")
+    max_commits = os.environ.get("AUDIT_MAX_COMMITS")
+    commits = parse_git_log(since=since, max_commits=max_commits)
+    print(f"Found {len(commits)} data commits to process.")
 
-    # Output to flat audit.json in repo root (minified)
     output_path = os.path.join(config.BASE_DIR, "audit.json")
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(audit_entries, f, separators=(",", ":"))
+    meta_path = os.path.join(config.BASE_DIR, ".audit_cache.json")
+    existing, empty = load_existing_entries(output_path, meta_path)
+    listed = {c["commit"] for c in commits}
+    if not (since or max_commits):
+        # A full walk lists every commit still in history; forget the rest
+        empty &= listed
+    pending = [c for c in commits if c["commit"] not in existing and c["commit"] not in empty]
+    if existing or empty:
+        print(f"Reusing {len(commits) - len(pending)} cached commits; diffing {len(pending)} new ones.")
+
+    # Every (commit, file) pair is independent, so a thread pool overlaps their work.
+    # Blobs are read on demand through one `git cat-file --batch` coprocess
+    # instead of spawning `git show` once or twice per changed file.
+    tasks = [
+        (c["commit"], status, filepath, c.get("blobs", {}).get(filepath))
+        for c in pending
+        for status, filepath in c["files"]
+    ]
+    with (
+        batch_reader(cwd=config.BASE_DIR),
+        ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as pool,
+    ):
+        results = pool.map(_diff_one, tasks)
+
+        # Output to flat audit.json in repo root (minified). Entries are streamed as they
+        # are produced so the whole log is never held as one serialized string. They go to a
+        # sibling temp file that replaces audit.json only once complete, so a failed run
+        # leaves the previous log (and the entries it caches) intact.
+        count = 0
+        tmp_path = f"{output_path}.tmp"
+        try:
+            with open(tmp_path, "wb", buffering=1 << 20) as f:
+                f.write(b"[")
+                entries = _iter_audit_entries(commits, existing, empty, results)
+                if since or max_commits:
+                    # Older cached entries fall outside the bounded walk; keep them after the new ones
+                    older = (entry for commit, entry in existing.items() if commit not in listed)
+                    entries = itertools.chain(entries, older)
+                for entry in entries:
+                    if count:
+                        f.write(b",")
+                    f.write(orjson.dumps(entry))
+                    count += 1
+                f.write(b"]")
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+            raise
 
-    print(f"Audit log generated: {output_path} ({len(audit_entries)} commits)")
+    # Written only after audit.json is in place, so the sidecar never vouches for an older log
+    save_audit_meta(meta_path, empty)
+    print(f"Audit log generated: {output_path} ({count} commits)")
 
 
 def main():
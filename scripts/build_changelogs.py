@@ -12,10 +12,13 @@ the following API-consumable files in the repository root:
 These root files are then copied into `api/v2/` by `build_api.py`.
 """
 
-import json
+import itertools
 import math
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 import config  # noqa: E402
@@ -31,18 +34,18 @@ def load_json(path):
     """Safely loads a JSON file."""
     if not os.path.exists(path):
         return None
-    with open(path, encoding="utf-8") as f:
+    with open(path, "rb") as f:
         try:
-            return json.load(f)
-        except json.JSONDecodeError as e:
+            return orjson.loads(f.read())
+        except orjson.JSONDecodeError as e:
             print(f"[ERROR] Could not parse {path}: {e}")
             return None
 
 
 def save_json(path, data):
     """Writes data to a JSON file with consistent formatting."""
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
     print(f"[OK] Generated {os.path.basename(path)}")
 
 
@@ -50,8 +53,11 @@ def clean_patches(patches):
     """Strips legacy keys that should not appear in the public API."""
     cleaned = []
     for patch in patches:
-        entry = {k: v for k, v in patch.items() if k != "diff"}
-        cleaned.append(entry)
+        if "diff" in patch:
+            # Copy only legacy entries (C-level dict copy + O(1) delete); the input stays untouched
+            patch = dict(patch)
+            del patch["diff"]
+        cleaned.append(patch)
     return cleaned
 
 
@@ -82,17 +88,22 @@ def main():
     total_patches = len(patches)
     total_pages = max(1, math.ceil(total_patches / PAGE_SIZE))
     page_filenames = []
+    page_tasks = []
 
+    # One pass over the list; an empty list still yields a single (empty) page
+    remaining = iter(patches)
     for page_num in range(1, total_pages + 1):
-        start = (page_num - 1) * PAGE_SIZE
-        end = start + PAGE_SIZE
-        page_data = patches[start:end]
+        page_data = list(itertools.islice(remaining, PAGE_SIZE))
 
         page_filename = f"changelog_page_{page_num}.json"
-        page_path = os.path.join(ROOT_DIR, page_filename)
-        save_json(page_path, page_data)
+        page_tasks.append((os.path.join(ROOT_DIR, page_filename), page_data))
         page_filenames.append(page_filename)
 
+    # Pages are independent files; write them concurrently (file writes release the GIL)
+    with ThreadPoolExecutor(max_workers=min(8, len(page_tasks))) as pool:
+        for _ in pool.map(lambda task: save_json(*task), page_tasks):
+            pass
+
     # --- 4. changelog_index.json (pagination manifest) ---
     index_path = os.path.join(ROOT_DIR, "changelog_index.json")
     index_data = {
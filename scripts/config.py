@@ -5,12 +5,14 @@ Shared configuration module for Spellcasters API scripts.
 This module defines:
 - Directory paths (DATA_DIR, ASSETS_DIR, etc.)
 - Schema mappings (SCHEMA_FILES)
-- Helper functions (load_json)
+- Helper functions (load_json, iter_json_files)
 """
 
-import json
+import functools
 import os
 
+import orjson
+
 # Base Directories
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(BASE_DIR, "data")
@@ -29,6 +31,7 @@ PATCH_HISTORY_FILES = [
     "changelog_latest.json",
 ]
 PATCH_HISTORY_DIR = "timeline"
+TIMELINE_DIR = os.path.join(BASE_DIR, PATCH_HISTORY_DIR)
 
 # Schema Filenames mapping (Schema Key -> Filename)
 SCHEMA_FILES = {
@@ -64,10 +67,40 @@ FOLDER_TO_SCHEMA = {
 }
 
 
+@functools.lru_cache(maxsize=256)
+def _read_bytes_cached(path, ino, mtime_ns, ctime_ns, size):
+    """
+    Reads a file's raw bytes. Keyed on inode, mtime, ctime and size so edited or
+    replaced files are re-read. ctime is bumped by every write (and cannot be set
+    back by os.utime), which covers same-size rewrites landing in the same mtime tick.
+    """
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def read_json_bytes(path):
+    """
+    Returns a file's raw bytes through the shared mtime-keyed cache, so the
+    integrity check and the API build read each data file from disk only once.
+
+    Args:
+        path (str): Path to the file.
+
+    Returns:
+        bytes: The file contents.
+    """
+    st = os.stat(path)
+    return _read_bytes_cached(os.path.abspath(path), st.st_ino, st.st_mtime_ns, st.st_ctime_ns, st.st_size)
+
+
 def load_json(path):
     """
     Safely loads a JSON file.
 
+    Raw bytes are cached (bounded LRU keyed on path + inode + mtime + ctime + size), so repeat
+    loads skip the disk read. Each call still parses into a fresh object, so
+    callers may mutate the result freely.
+
     Args:
         path (str): Absolute path to the JSON file.
 
@@ -75,8 +108,37 @@ def load_json(path):
         dict: The parsed JSON data, or None if loading failed.
     """
     try:
-        with open(path, encoding="utf-8") as f:
-            return json.load(f)
+        return orjson.loads(read_json_bytes(path))
     except Exception as e:
         print(f"[ERROR] Invalid JSON in {path}: {e}")
         return None
+
+
+def iter_json_files(root, suffix=".json", recursive=True):
+    """
+    Yields paths of JSON files under a directory using os.scandir.
+
+    Dotfiles are skipped, matching glob's default behaviour. Missing
+    directories yield nothing.
+
+    Args:
+        root (str): Directory to scan.
+        suffix (str): Filename suffix to match (e.g. '.schema.json').
+        recursive (bool): Whether to descend into subdirectories.
+
+    Yields:
+        str: Path of each matching file.
+    """
+    try:
+        entries = list(os.scandir(root))
+    except (FileNotFoundError, NotADirectoryError):
+        return
+
+    for entry in entries:
+        if entry.name.startswith("."):
+            continue
+        if entry.is_dir(follow_symlinks=False):
+            if recursive:
+                yield from iter_json_files(entry.path, suffix, recursive)
+        elif entry.name.endswith(suffix) and entry.is_file():
+            yield entry.path
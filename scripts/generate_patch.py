@@ -1,41 +1,80 @@
 import glob
-import json
 import os
+import re
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
+from typing import Any
 
 import config
-from patch_utils import compute_diff, get_file_content_at_commit, load_json, save_json
+from patch_utils import (
+    batch_reader,
+    compute_diff,
+    get_file_content_at_commit,
+    get_files_at_commit,
+    list_files_at_commit,
+    load_json,
+    read_file_at_commit,
+    save_json,
+)
 
 GAME_CONFIG_PATH = os.path.join(config.DATA_DIR, "game_config.json")
 PATCHES_FILE = os.path.join(config.DATA_DIR, "patches.json")
-TIMELINE_DIR = os.path.join(config.BASE_DIR, "timeline")
+TIMELINE_DIR = config.TIMELINE_DIR
 
 
-def discover_version_boundaries(current_version):
+def version_ahead_of(current_version):
+    """
+    Returns a predicate telling whether a version is newer than current_version.
+    The current version is parsed once, not on every comparison. Uses
+    packaging's version ordering when available, plain string order otherwise.
+    """
+    try:
+        from packaging.version import parse as parse_version
+    except ImportError:
+        return lambda version: version != current_version and version > current_version
+
+    current = parse_version(current_version)
+    return lambda version: parse_version(version) > current
+
+
+# A top-level "version" entry in indent=2 game_config.json; changelog entries sit deeper
+_CONFIG_VERSION_RE = re.compile(rb'^  "version": "([^"\\]*)",?\r?$', re.MULTILINE)
+
+
+def read_config_version(commit_hash):
+    """
+    Returns the "version" of game_config.json at a commit. The top-level line is
+    matched in the raw file, so the changelog is never parsed; anything unusual
+    (other formatting, duplicate keys, no batch reader) falls back to a full parse.
+    """
+    raw = read_file_at_commit("data/game_config.json", commit_hash)
+    if raw is not None:
+        matches = _CONFIG_VERSION_RE.findall(raw)
+        if len(matches) == 1:
+            return matches[0].decode()
+    return get_file_content_at_commit("data/game_config.json", commit_hash).get("version")
+
+
+def discover_version_boundaries(current_version, wanted_versions=None):
     """
     Walks git history of game_config.json to find the first commit of each version.
     Returns: list of dicts [{'version': '0.0.1', 'commit': 'abc1234'}, ...] oldest to newest.
     Only includes versions <= current_version to handle messy resets.
+    If wanted_versions is given, the walk stops once all of them have been found,
+    since later commits can only introduce versions the caller will discard.
     """
     import subprocess
 
     boundaries = []
     seen_versions = set()
-
-    try:
-        from packaging.version import parse as parse_version
-
-        curr_ver_parsed = parse_version(current_version)
-        use_packaging = True
-    except ImportError:
-        use_packaging = False
+    is_ahead = version_ahead_of(current_version)
 
     # Get all commits that touched game_config.json, oldest first
     try:
         result = subprocess.run(
-            ["git", "log", "--reverse", "--format=%H", "data/game_config.json"],
+            ["git", "log", "--reverse", "--format=%H", "--", "data/game_config.json"],
             capture_output=True,
             text=True,
             check=True,
@@ -45,26 +84,23 @@ def discover_version_boundaries(current_version):
         print("Warning: Could not read git history for game_config.json")
         return []
 
+    remaining = set(wanted_versions) if wanted_versions is not None else None
     for commit in commits:
+        if remaining is not None and not remaining:
+            break
         try:
-            # Read game_config.json at that specific commit
-            show = subprocess.run(
-                ["git", "show", f"{commit}:data/game_config.json"], capture_output=True, text=True, check=True
-            )
-            data = json.loads(show.stdout)
-            version = data.get("version")
+            # Read game_config.json's version at that specific commit
+            version = read_config_version(commit)
 
             # Skip historical boundaries that are "ahead" of our current baseline
-            if use_packaging:
-                if parse_version(version) > curr_ver_parsed:
-                    continue
-            else:
-                if version != current_version and version > current_version:
-                    continue
+            if is_ahead(version):
+                continue
 
             if version and version not in seen_versions:
                 boundaries.append({"version": version, "commit": commit})
                 seen_versions.add(version)
+                if remaining is not None:
+                    remaining.discard(version)
         except Exception:
             pass
 
@@ -73,13 +109,33 @@ def discover_version_boundaries(current_version):
     return boundaries
 
 
+# Working-tree documents parsed during this run, keyed by (path, mtime)
+_disk_cache: dict[tuple[str, int], Any] = {}
+
+
+def load_current_json(path):
+    """load_json for working-tree files, memoized so the active version's snapshot
+    and diff passes parse each file once."""
+    try:
+        key = (os.path.normpath(path), os.stat(path).st_mtime_ns)
+    except OSError:
+        return load_json(path)
+    if key not in _disk_cache:
+        _disk_cache[key] = load_json(path)
+    return _disk_cache[key]
+
+
 def get_changed_files_between(before_sha, after_sha):
     """Gets all data/ files changed between two commits."""
     if not before_sha:
         return []
     try:
+        # The pathspec lets git skip everything outside data/ instead of listing it for us to discard
         result = subprocess.run(
-            ["git", "diff", "--name-status", before_sha, after_sha], capture_output=True, text=True, check=True
+            ["git", "diff", "--name-status", before_sha, after_sha, "--", "data/"],
+            capture_output=True,
+            text=True,
+            check=True,
         )
         changed = []
         for line in result.stdout.strip().split("\n"):
@@ -104,6 +160,12 @@ def get_changed_files_between(before_sha, after_sha):
 
 def get_entity_files_at_commit(commit_hash):
     """Lists all entity data files (data/{folder}/*.json) at a specific git commit."""
+    # With a batch reader active, each entity folder's tree is read from the shared
+    # cat-file process instead of spawning `git ls-tree` per version
+    listed = [list_files_at_commit(f"data/{folder}", commit_hash) for folder in config.FOLDER_TO_SCHEMA]
+    if any(names is not None for names in listed):
+        return sorted(path for names in listed if names for path in names if path.endswith(".json"))
+
     entity_files = []
     try:
         result = subprocess.run(
@@ -121,14 +183,15 @@ def get_entity_files_at_commit(commit_hash):
     return entity_files
 
 
-def collect_timeline_snapshot(version, commit_hash, is_active):
+def collect_timeline_snapshot(version, commit_hash, is_active, date=None):
     """Collects entity snapshots for a single version boundary.
 
     Returns a dict of {entity_id: {version, date, snapshot}} entries.
     For the active version, reads from disk. For historical versions, reads from git.
+    `date` defaults to today (UTC); a full run passes its own start date to every version.
     """
     snapshots = {}
-    date = datetime.now(UTC).strftime("%Y-%m-%d")
+    date = date or datetime.now(UTC).strftime("%Y-%m-%d")
 
     if is_active:
         # Active version: read from disk (most up-to-date)
@@ -137,7 +200,7 @@ def collect_timeline_snapshot(version, commit_hash, is_active):
             if not os.path.exists(src_dir):
                 continue
             for path in glob.glob(os.path.join(src_dir, "*.json")):
-                data = load_json(path)
+                data = load_current_json(path)
                 if not data:
                     continue
                 entity_id = os.path.splitext(os.path.basename(path))[0]
@@ -145,8 +208,8 @@ def collect_timeline_snapshot(version, commit_hash, is_active):
     else:
         # Historical version: read from git at the commit
         entity_files = get_entity_files_at_commit(commit_hash)
-        for filepath in entity_files:
-            data = get_file_content_at_commit(filepath, commit_hash)
+        contents = get_files_at_commit(entity_files, commit_hash)
+        for filepath, data in zip(entity_files, contents, strict=True):
             if not data:
                 continue
             entity_id = os.path.splitext(os.path.basename(filepath))[0]
@@ -162,12 +225,15 @@ def write_timeline_files(timeline_data):
         timeline_data: dict of {entity_id: [snapshot_1, snapshot_2, ...]}
     """
     os.makedirs(TIMELINE_DIR, exist_ok=True)
-    count = 0
-    for entity_id, snapshots in timeline_data.items():
-        timeline_path = os.path.join(TIMELINE_DIR, f"{entity_id}.json")
-        save_json(timeline_path, snapshots)
-        count += 1
-    print(f"  Wrote {count} timeline files.")
+    tasks = [
+        (os.path.join(TIMELINE_DIR, f"{entity_id}.json"), snapshots) for entity_id, snapshots in timeline_data.items()
+    ]
+    # Timeline files are independent; write them concurrently (file I/O releases the GIL)
+    if tasks:
+        with ThreadPoolExecutor(max_workers=min(8, len(tasks))) as pool:
+            for _ in pool.map(lambda task: save_json(*task), tasks):
+                pass
+    print(f"  Wrote {len(tasks)} timeline files.")
 
 
 def main():
@@ -178,11 +244,26 @@ def main():
         sys.exit(1)
 
     game_config = load_json(GAME_CONFIG_PATH)
+
+    # Every historical file read goes through one `git cat-file --batch` coprocess
+    # instead of spawning `git show` per file. Reads are memoized: a version's
+    # snapshot commit is the next version's diff baseline.
+    try:
+        with batch_reader(memoize=True):
+            generate_patches(game_config)
+    finally:
+        _disk_cache.clear()
+
+
+def generate_patches(game_config):
+    """Computes patches.json and the timeline snapshots from the version boundaries in git."""
     current_version = game_config.get("version", "0.0.1")
+    # One date for the whole run, so every snapshot and new patch block agrees
+    run_date = datetime.now(UTC).strftime("%Y-%m-%d")
 
     # Only recognize versions that exist in the official changelog
     official_versions = {entry["version"] for entry in game_config.get("changelog", [])}
-    all_boundaries = discover_version_boundaries(current_version)
+    all_boundaries = discover_version_boundaries(current_version, official_versions)
     boundaries = [b for b in all_boundaries if b["version"] in official_versions]
 
     # Timeline accumulator: {entity_id: [{version, date, snapshot}, ...]}
@@ -191,7 +272,7 @@ def main():
     if not boundaries:
         print("No version boundaries found in git. Assuming fresh start.")
         # Fresh start: snapshot current disk state as the only timeline entry
-        snapshots = collect_timeline_snapshot(current_version, "HEAD", is_active=True)
+        snapshots = collect_timeline_snapshot(current_version, "HEAD", is_active=True, date=run_date)
         for entity_id, snap in snapshots.items():
             timeline_data[entity_id] = [snap]
         write_timeline_files(timeline_data)
@@ -200,6 +281,11 @@ def main():
     print(f"Found {len(boundaries)} version boundaries in git logs.")
 
     patches = load_json(PATCHES_FILE) or []
+    # First entry wins, matching a front-to-back scan of the list
+    patches_by_version = {}
+    for p in patches:
+        patches_by_version.setdefault(p.get("version"), p)
+    is_ahead = version_ahead_of(current_version)
 
     # Process each version from oldest to newest
     for i in range(len(boundaries)):
@@ -219,39 +305,33 @@ def main():
 
         # --- Timeline: Capture entity snapshots at every version (including 0.0.1 baseline) ---
         # Always use start_commit — it's the commit that introduced this version
-        version_snapshots = collect_timeline_snapshot(version, start_commit, is_active)
+        version_snapshots = collect_timeline_snapshot(version, start_commit, is_active, date=run_date)
         for entity_id, snap in version_snapshots.items():
             if entity_id not in timeline_data:
                 timeline_data[entity_id] = []
             timeline_data[entity_id].append(snap)
 
         # --- Patch Generation: Skip 0.0.1 baseline and future versions ---
-        patch_meta = next((p for p in patches if p.get("version") == version), None)
+        patch_meta = patches_by_version.get(version)
         if not patch_meta:
             if version == "0.0.1":
                 print(f"  Skipping patch generation for {version} (initial baseline)")
                 continue
 
-            try:
-                from packaging.version import parse as parse_version
-
-                if parse_version(version) > parse_version(current_version):
-                    print(f"  Skipping patch generation for {version} (ahead of current baseline {current_version})")
-                    continue
-            except ImportError:
-                if version != current_version and version > current_version:
-                    print(f"  Skipping patch generation for {version} (ahead of current baseline {current_version})")
-                    continue
+            if is_ahead(version):
+                print(f"  Skipping patch generation for {version} (ahead of current baseline {current_version})")
+                continue
 
             patch_meta = {
                 "id": f"patch_{version.replace('.', '_')}",
                 "version": version,
-                "date": datetime.now(UTC).isoformat()[:10],
+                "date": run_date,
                 "type": "Patch",
                 "title": f"Patch {version}",
                 "tags": [],
             }
             patches.insert(0, patch_meta)
+            patches_by_version[version] = patch_meta
 
         # Compute dynamic diffs from baseline
         if i == 0:
@@ -279,14 +359,14 @@ def main():
             elif status == "A":
                 old_data = {}
                 if is_active:
-                    new_data = load_json(os.path.join(config.BASE_DIR, filepath))
+                    new_data = load_current_json(os.path.join(config.BASE_DIR, filepath))
                 else:
                     new_data = get_file_content_at_commit(filepath, end_commit)
                 change_type = "add"
             else:
                 old_data = get_file_content_at_commit(filepath, before_sha)
                 if is_active:
-                    new_data = load_json(os.path.join(config.BASE_DIR, filepath))
+                    new_data = load_current_json(os.path.join(config.BASE_DIR, filepath))
                 else:
                     new_data = get_file_content_at_commit(filepath, end_commit)
                 change_type = "edit"
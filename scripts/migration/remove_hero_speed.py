@@ -1,27 +1,27 @@
-import glob
 import json
 import os
 
 
 def remove_hero_speed():
     heroes_dir = os.path.join(os.path.dirname(__file__), "../../data/heroes")
-    files = glob.glob(os.path.join(heroes_dir, "*.json"))
+    entries = [e for e in os.scandir(heroes_dir) if e.is_file() and e.name.endswith(".json")]
 
-    print(f"Found {len(files)} hero files.")
+    print(f"Found {len(entries)} hero files.")
 
-    for filepath in files:
-        with open(filepath, encoding="utf-8") as f:
-            data = json.load(f)
+    for entry in entries:
+        with open(entry.path, "rb") as f:
+            raw = f.read()
 
-        if "movement_speed" in data:
-            print(f"Removing movement_speed from {os.path.basename(filepath)}")
+        # Files that never mention the key cannot contain it; skip parsing them
+        data = json.loads(raw) if b'"movement_speed"' in raw else None
+        if data is not None and "movement_speed" in data:
+            print(f"Removing movement_speed from {entry.name}")
             del data["movement_speed"]
 
-            with open(filepath, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
-                f.write("\n")  # Add trailing newline
+            with open(entry.path, "w", encoding="utf-8") as f:
+                f.write(json.dumps(data, indent=2) + "\n")  # Add trailing newline
         else:
-            print(f"Skipping {os.path.basename(filepath)} (no movement_speed)")
+            print(f"Skipping {entry.name} (no movement_speed)")
 
 
 if __name__ == "__main__":
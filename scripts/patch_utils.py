@@ -2,106 +2,519 @@
 Shared utility functions for patch and audit generation scripts.
 """
 
+import contextlib
+import itertools
 import json
 import os
 import re
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
+import orjson
 from deepdiff import DeepDiff
 
 
 def load_json(path):
     if not os.path.exists(path):
         return None
-    with open(path, encoding="utf-8") as f:
+    with open(path, "rb") as f:
         try:
-            return json.load(f)
-        except json.JSONDecodeError:
+            return orjson.loads(f.read())
+        except orjson.JSONDecodeError:
             return None
 
 
 def save_json(path, data):
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    # Stays on stdlib json: the committed timeline/patches files are ASCII-escaped,
+    # which orjson cannot produce, so switching would rewrite every file.
+    # Encode the whole payload first: json.dump issues one write() per token
+    payload = json.dumps(data, indent=2)
+    # Most runs regenerate identical output (e.g. every historical patch block);
+    # leave those files untouched instead of rewriting them in full
+    with contextlib.suppress(OSError, UnicodeDecodeError), open(path, encoding="utf-8") as f:
+        if f.read() == payload:
+            return
+    # Write beside the target and swap it in, so readers never see a half-written file
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+def _loads_or_none(raw):
+    if raw is None:
+        return None
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return None
+
+
+class BatchCatFile:
+    """
+    A long-lived `git cat-file --batch` coprocess. Each lookup writes one
+    object name to its stdin and reads the blob back from stdout, so reading
+    many files costs one process instead of one `git show` each.
+
+    Lookups are serialized with a lock, so one instance may be shared by threads.
+    With memoize=True, parsed JSON is kept per object name for the reader's
+    lifetime, and names that resolve to the same blob (say, an unchanged file
+    at two revisions) share one parsed document. Callers must then treat
+    returned documents as read-only.
+    """
+
+    def __init__(self, cwd=None, memoize=False):
+        self._proc = subprocess.Popen(
+            ["git", "cat-file", "--batch"], stdin=subprocess.PIPE, stdout=subprocess.PIPE, cwd=cwd
+        )
+        self._lock = threading.Lock()
+        self._parsed = {} if memoize else None
+        self._parsed_by_oid = {} if memoize else None
+        self._oid_len = 20
+
+    def read(self, rev, path):
+        """
+        Returns the raw bytes of `<rev>:<path>`, or None if git cannot resolve it.
+
+        Args:
+            rev (str): Any revision, e.g. "abc123" or "abc123~1".
+            path (str): Repository-relative file path.
+        """
+        return self.read_object(f"{rev}:{path}")
+
+    def read_object(self, name, kind=b"blob"):
+        """
+        Returns the raw bytes of an object, or None if git cannot resolve it
+        or it is not of the expected type.
+
+        Args:
+            name (str): Any object name git accepts, e.g. a blob SHA or "<rev>:<path>".
+            kind (bytes): Expected object type, b"blob" or b"tree".
+        """
+        with self._lock:
+            return self._request(name, kind)[1]
+
+    def _request(self, name, kind):
+        """Sends one name and reads its reply as (object id, data); the caller must hold the lock."""
+        try:
+            self._proc.stdin.write(f"{name}\n".encode())
+            self._proc.stdin.flush()
+        except OSError:
+            return None, None
+        return self._read_reply(kind)
+
+    def read_many(self, names, kind=b"blob"):
+        """
+        Like read_object for several names at once. The requests are pipelined:
+        a feeder thread writes them all while this thread reads the replies, so
+        git never sits idle waiting for the next request.
+
+        Args:
+            names (list[str]): Object names, as for read_object.
+            kind (bytes): Expected object type.
+
+        Returns:
+            list[bytes | None]: One entry per name, in order.
+        """
+        return [data for _, data in self._read_many(names, kind)]
+
+    def _read_many(self, names, kind):
+        """read_many, returning (object id, data) pairs."""
+        if not names:
+            return []
+        with self._lock:
+            if len(names) == 1:
+                # Nothing to pipeline; a feeder thread would only add start/join overhead
+                return [self._request(names[0], kind)]
+            feeder = threading.Thread(target=self._feed, args=(names,), daemon=True)
+            feeder.start()
+            try:
+                return [self._read_reply(kind) for _ in names]
+            finally:
+                feeder.join()
+
+    def _feed(self, names):
+        try:
+            self._proc.stdin.write("".join(f"{name}\n" for name in names).encode())
+            self._proc.stdin.flush()
+        except OSError:
+            pass
+
+    def _read_reply(self, kind):
+        """Reads one cat-file reply as (object id, data); the caller must hold the lock."""
+        try:
+            header = self._proc.stdout.readline()
+            # Found: "<sha> <type> <size>"; otherwise "<name> missing" / "<name> ambiguous"
+            fields = header.split()
+            if len(fields) != 3 or not fields[2].isdigit() or header.rstrip().endswith((b"missing", b"ambiguous")):
+                return None, None
+            # SHA-1 and SHA-256 repositories differ in the binary id width inside trees
+            self._oid_len = len(fields[0]) // 2
+            data = self._proc.stdout.read(int(fields[2]))
+            self._proc.stdout.read(1)  # trailing newline
+        except (OSError, ValueError):
+            return None, None
+        return (fields[0], data) if fields[1] == kind else (None, None)
+
+    def list_files(self, rev, path):
+        """
+        Lists the repository-relative paths of all files under a directory at a
+        revision (like `git ls-tree -r --name-only`), or None if it is not a directory.
+
+        Args:
+            rev (str): Any revision.
+            path (str): Repository-relative directory path, without a trailing slash.
+        """
+        root = self.read_object(f"{rev}:{path}", kind=b"tree")
+        if root is None:
+            return None
+        files = []
+        pending = [(path, root)]
+        while pending:
+            prefix, raw = pending.pop()
+            # Raw tree entries: "<mode> <name>\0<binary object id>"
+            pos = 0
+            while pos < len(raw):
+                nul = raw.index(b"\0", pos)
+                mode, _, entry = raw[pos:nul].partition(b" ")
+                oid = raw[nul + 1 : nul + 1 + self._oid_len]
+                pos = nul + 1 + self._oid_len
+                entry_path = f"{prefix}/{entry.decode()}"
+                if mode == b"40000":
+                    subtree = self.read_object(oid.hex(), kind=b"tree")
+                    if subtree is not None:
+                        pending.append((entry_path, subtree))
+                else:
+                    files.append(entry_path)
+        return sorted(files)
+
+    def get(self, rev, path):
+        """Returns the parsed JSON content of `<rev>:<path>`, or None."""
+        return self.get_object(f"{rev}:{path}")
+
+    def get_object(self, name):
+        """Returns the parsed JSON content of an object name (e.g. a blob SHA), or None."""
+        if self._parsed is None:
+            return _loads_or_none(self.read_object(name))
+        return self.get_many([name])[0]
+
+    def get_many(self, names):
+        """Returns the parsed JSON content of several object names (None where missing)."""
+        memo = self._parsed if self._parsed is not None else {}
+        todo = [name for name in dict.fromkeys(names) if name not in memo]
+        if self._parsed is None:
+            fetched = dict(zip(todo, map(_loads_or_none, self.read_many(todo)), strict=True))
+        else:
+            fetched = {}
+            for name, (oid, data) in zip(todo, self._read_many(todo, b"blob"), strict=True):
+                if oid is None:
+                    fetched[name] = None
+                elif oid in self._parsed_by_oid:
+                    fetched[name] = self._parsed_by_oid[oid]
+                else:
+                    fetched[name] = self._parsed_by_oid[oid] = _loads_or_none(data)
+            self._parsed.update(fetched)
+        return [fetched[name] if name in fetched else memo[name] for name in names]
+
+    def close(self):
+        if self._proc.stdin:
+            self._proc.stdin.close()
+        self._proc.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Reader that get_file_content_at_commit routes through while batch_reader() is active
+_batch = None
+
+
+@contextlib.contextmanager
+def batch_reader(cwd=None, memoize=False):
+    """
+    Serves get_file_content_at_commit from one shared BatchCatFile for the
+    duration of the block. If the coprocess cannot start, calls fall back to
+    `git show`.
+
+    Args:
+        cwd (str | None): Repository directory to run git in.
+        memoize (bool): Keep parsed documents so repeated (commit, path) reads are free.
+    """
+    global _batch
+    try:
+        reader = BatchCatFile(cwd, memoize=memoize)
+    except OSError:
+        yield None
+        return
+    _batch = reader
+    try:
+        yield reader
+    finally:
+        _batch = None
+        reader.close()
 
 
 def get_file_content_at_commit(filepath, commit_hash):
     """Fetches the JSON content of a file at a specific Git commit."""
+    if _batch is not None:
+        return _batch.get(commit_hash, filepath)
     try:
-        result = subprocess.run(
-            ["git", "show", f"{commit_hash}:{filepath}"], capture_output=True, text=True, check=True
-        )
-        return json.loads(result.stdout)
+        # Raw bytes straight into orjson; no UTF-8 decode into an intermediate str
+        result = subprocess.run(["git", "show", f"{commit_hash}:{filepath}"], capture_output=True, check=True)
+        return orjson.loads(result.stdout)
     except Exception:
         return None
 
 
+def get_files_at_commit(filepaths, commit_hash):
+    """
+    Fetches the JSON content of several files at one commit (None where missing).
+    With a batch reader active the reads are pipelined through it; otherwise the
+    `git show` calls run on a thread pool.
+    """
+    if _batch is not None:
+        return _batch.get_many([f"{commit_hash}:{filepath}" for filepath in filepaths])
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        return list(pool.map(get_file_content_at_commit, filepaths, itertools.repeat(commit_hash)))
+
+
+def read_file_at_commit(filepath, commit_hash):
+    """
+    Returns the raw bytes of a file at a commit through the active batch reader.
+    Returns None when no batch reader is active or the file does not exist, so
+    callers can fall back to get_file_content_at_commit.
+    """
+    if _batch is None:
+        return None
+    return _batch.read(commit_hash, filepath)
+
+
+def list_files_at_commit(dirpath, commit_hash):
+    """
+    Lists all files under `dirpath` at a commit through the active batch reader.
+    Returns None when no batch reader is active or the directory does not exist,
+    so callers can fall back to `git ls-tree`.
+    """
+    if _batch is None:
+        return None
+    return _batch.list_files(commit_hash, dirpath)
+
+
+def get_blob_content(blob_sha):
+    """
+    Fetches the JSON content of a blob by its SHA (as reported by `git log --raw`).
+    An all-zero SHA (the side of an add/delete with no file) returns None.
+    """
+    if not blob_sha.strip("0"):
+        return None
+    if _batch is not None:
+        return _batch.get_object(blob_sha)
+    try:
+        result = subprocess.run(["git", "cat-file", "blob", blob_sha], capture_output=True, check=True)
+        return orjson.loads(result.stdout)
+    except Exception:
+        return None
+
+
+# DeepDiff quotes keys with ' unless the key itself contains one, then it uses "
+_DEEPDIFF_PATH_RE = re.compile(r"""\['([^']*)'\]|\["([^"]*)"\]|\[(\d+)\]""")
+
+
 def _parse_deepdiff_path(path):
     """Parses a DeepDiff path string like root['stats']['attack'] or root['tags'][0]
     into a clean list of keys: ['stats', 'attack'] or ['tags', 0]."""
-    matches = re.findall(r"\['([^']+)'\]|\[(\d+)\]", path)
-    return [m[0] if m[0] else int(m[1]) for m in matches]
+    keys = []
+    for single, double, index in (m.groups() for m in _DEEPDIFF_PATH_RE.finditer(path)):
+        if index is not None:
+            keys.append(int(index))
+        else:
+            keys.append(single if single is not None else double)
+    return keys
+
+
+def _resolve(data, keys):
+    """Follows a key list into a document; raises LookupError/TypeError if it does not exist."""
+    for key in keys:
+        data = data[key]
+    return data
+
+
+# DeepDiff reports a whole dict as replaced when fewer than this share of its keys are shared
+_DIFF_DEEPER_THRESHOLD = 0.33
+
+# ignore_order pairs up list items by distance; caching those pair distances lets
+# repeated items (e.g. identical ability entries) skip the quadratic re-comparison.
+# Auto-tuning is off because its sampling costs more than it saves on lists this size.
+_DEEPDIFF_OPTIONS = {"ignore_order": True, "cache_size": 5000, "cache_tuning_sample_size": 0}
+
+# Diff categories, in the order compute_diff lists them
+_DIFF_CATEGORIES = (
+    "dictionary_item_added",
+    "dictionary_item_removed",
+    "values_changed",
+    "type_changes",
+    "iterable_item_added",
+    "iterable_item_removed",
+)
+
+
+def _same(a, b):
+    """Type-strict equality, so 1, 1.0 and True differ the way they do for DeepDiff."""
+    if a is b:
+        return True
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(_same(v, b[k]) for k, v in a.items())
+    if isinstance(a, list):
+        return len(a) == len(b) and all(_same(x, y) for x, y in zip(a, b, strict=True))
+    return a == b
+
+
+def _same_ignoring(old, new, excluded):
+    """_same for two documents, disregarding one top-level key."""
+    if not (isinstance(old, dict) and isinstance(new, dict)):
+        return _same(old, new)
+    if old.keys() - {excluded} != new.keys() - {excluded}:
+        return False
+    return all(_same(value, new[key]) for key, value in old.items() if key != excluded)
+
+
+def _key_repr(key):
+    """
+    Formats a dict key the way DeepDiff writes it into a path string. Keys that
+    _parse_deepdiff_path could not read back (both quote kinds, non-strings)
+    raise TypeError so the caller falls back to DeepDiff.
+    """
+    if isinstance(key, str):
+        if "'" not in key:
+            return f"['{key}']"
+        if '"' not in key:
+            return f'["{key}"]'
+    raise TypeError(key)
+
+
+def _add_value_change(out, keys, old_val, new_val):
+    if not keys and isinstance(new_val, dict) and isinstance(old_val, dict):
+        # Root-level change (e.g. {} -> {full dict}). Decompose into per-key diffs.
+        for k in set(list(new_val.keys()) + list(old_val.keys())):
+            if k == "last_modified":
+                continue
+            if k in new_val and k not in old_val:
+                out["values_changed"].append({"path": [k], "new_value": new_val[k]})
+            elif k in old_val and k not in new_val:
+                out["values_changed"].append({"path": [k], "removed": True})
+            elif old_val.get(k) != new_val.get(k):
+                out["values_changed"].append({"path": [k], "old_value": old_val[k], "new_value": new_val[k]})
+    else:
+        out["values_changed"].append({"path": keys, "old_value": old_val, "new_value": new_val})
+
+
+def _add_deepdiff(out, diff, prefix, new_data):
+    """
+    Formats a DeepDiff text result into the per-category buckets.
+
+    Args:
+        out (dict): Category -> list of formatted diffs.
+        diff (DeepDiff): Result whose "root" sits at `prefix` within the document.
+        prefix (str): DeepDiff path string of the diffed value, e.g. "root['tags']".
+        new_data: The whole new document, for resolving added values.
+    """
+    for path in diff.get("dictionary_item_added", ()):
+        keys = _parse_deepdiff_path(prefix + path[len("root") :])
+        try:
+            val = _resolve(new_data, keys)
+        except (LookupError, TypeError):
+            val = "[Complex Value]"
+        out["dictionary_item_added"].append({"path": keys, "new_value": val})
+
+    for path in diff.get("dictionary_item_removed", ()):
+        keys = _parse_deepdiff_path(prefix + path[len("root") :])
+        out["dictionary_item_removed"].append({"path": keys, "removed": True})
+
+    for path, change in diff.get("values_changed", {}).items():
+        keys = _parse_deepdiff_path(prefix + path[len("root") :])
+        _add_value_change(out, keys, change.get("old_value", {}), change.get("new_value", {}))
+
+    for path, change in diff.get("type_changes", {}).items():
+        keys = _parse_deepdiff_path(prefix + path[len("root") :])
+        out["type_changes"].append({"path": keys, "old_value": change["old_value"], "new_value": change["new_value"]})
+
+    for path, val in diff.get("iterable_item_added", {}).items():
+        keys = _parse_deepdiff_path(prefix + path[len("root") :])
+        out["iterable_item_added"].append({"path": keys, "new_value": val})
+
+    for path, val in diff.get("iterable_item_removed", {}).items():
+        keys = _parse_deepdiff_path(prefix + path[len("root") :])
+        out["iterable_item_removed"].append({"path": keys, "removed": True, "old_value": val})
+
+
+def _walk_diff(old, new, keys, path, new_data, out, exclude=()):
+    """
+    Diffs two JSON values in one walk, formatting each change straight into its
+    category bucket. Follows DeepDiff's rules (strict types, the shared-key
+    threshold); only lists that actually differ are handed to DeepDiff, which
+    owns the ignore_order matching of list items.
+
+    Args:
+        old: Value from the old document.
+        new: Value from the new document.
+        keys (list): Path of this value as a key list.
+        path (str): The same path as a DeepDiff path string, e.g. "root['stats']".
+        new_data: The whole new document.
+        out (dict): Category -> list of formatted diffs.
+        exclude (tuple): Keys skipped at this level (the root's last_modified).
+    """
+    if type(old) is not type(new):
+        out["type_changes"].append({"path": keys, "old_value": old, "new_value": new})
+    elif isinstance(old, dict):
+        common = [k for k in new if k in old]
+        # As in DeepDiff, excluded keys still count as shared but not towards the union
+        union = len(new) + len(old) - len(common) - sum(1 for k in exclude if k in old or k in new)
+        if union > 1 and len(common) / union < _DIFF_DEEPER_THRESHOLD:
+            _add_value_change(out, keys, old, new)
+            return
+        for key in new:
+            if key not in old and key not in exclude:
+                _key_repr(key)
+                out["dictionary_item_added"].append({"path": [*keys, key], "new_value": new[key]})
+        for key in old:
+            if key not in new and key not in exclude:
+                _key_repr(key)
+                out["dictionary_item_removed"].append({"path": [*keys, key], "removed": True})
+        for key in common:
+            if key not in exclude:
+                _walk_diff(old[key], new[key], [*keys, key], path + _key_repr(key), new_data, out)
+    elif isinstance(old, list):
+        if not _same(old, new):
+            # A whole-document DeepDiff also applied its last_modified exclusion while
+            # pairing up list items (each candidate pair is diffed as its own root)
+            diff = DeepDiff(old, new, exclude_paths=["root['last_modified']"], **_DEEPDIFF_OPTIONS)
+            _add_deepdiff(out, diff, path, new_data)
+    elif not (old is new or old == new):
+        _add_value_change(out, keys, old, new)
 
 
 def compute_diff(old_data, new_data):
-    """Computes a DeepDiff and formats it."""
+    """Computes a DeepDiff-equivalent diff and formats it."""
     if old_data is None and new_data is None:
         return []
 
     # Exclude last_modified from diffing so we don't get noisy patch notes just for timestamp bumps
-    diff = DeepDiff(old_data or {}, new_data or {}, ignore_order=True, exclude_paths=["root['last_modified']"])
-    diffs = []
-
-    if "dictionary_item_added" in diff:
-        for path in diff["dictionary_item_added"]:
-            keys = _parse_deepdiff_path(path)
-            try:
-                val = eval("new_data" + path.replace("root", ""))
-            except Exception:
-                val = "[Complex Value]"
-            diffs.append({"path": keys, "new_value": val})
-
-    if "dictionary_item_removed" in diff:
-        for path in diff["dictionary_item_removed"]:
-            keys = _parse_deepdiff_path(path)
-            diffs.append({"path": keys, "removed": True})
-
-    if "values_changed" in diff:
-        for path, change in diff["values_changed"].items():
-            keys = _parse_deepdiff_path(path)
-            if not keys:
-                # Root-level change (e.g. {} -> {full dict}). Decompose into per-key diffs.
-                old_val = change.get("old_value", {})
-                new_val = change.get("new_value", {})
-                if isinstance(new_val, dict) and isinstance(old_val, dict):
-                    # Recursively diff the actual content
-                    for k in set(list(new_val.keys()) + list(old_val.keys())):
-                        if k == "last_modified":
-                            continue
-                        if k in new_val and k not in old_val:
-                            diffs.append({"path": [k], "new_value": new_val[k]})
-                        elif k in old_val and k not in new_val:
-                            diffs.append({"path": [k], "removed": True})
-                        elif old_val.get(k) != new_val.get(k):
-                            diffs.append({"path": [k], "old_value": old_val[k], "new_value": new_val[k]})
-                else:
-                    diffs.append({"path": keys, "old_value": change["old_value"], "new_value": change["new_value"]})
-            else:
-                diffs.append({"path": keys, "old_value": change["old_value"], "new_value": change["new_value"]})
-
-    if "type_changes" in diff:
-        for path, change in diff["type_changes"].items():
-            keys = _parse_deepdiff_path(path)
-            diffs.append({"path": keys, "old_value": change["old_value"], "new_value": change["new_value"]})
-
-    if "iterable_item_added" in diff:
-        for path, val in diff["iterable_item_added"].items():
-            keys = _parse_deepdiff_path(path)
-            diffs.append({"path": keys, "new_value": val})
-
-    if "iterable_item_removed" in diff:
-        for path, val in diff["iterable_item_removed"].items():
-            keys = _parse_deepdiff_path(path)
-            diffs.append({"path": keys, "removed": True, "old_value": val})
-
-    return diffs
+    old, new = old_data or {}, new_data or {}
+    if _same_ignoring(old, new, "last_modified"):
+        # Timestamp bumps, reformatting and reverts: nothing to walk
+        return []
+    out = {category: [] for category in _DIFF_CATEGORIES}
+    try:
+        _walk_diff(old, new, [], "root", new_data, out, exclude=("last_modified",))
+    except TypeError:
+        # Keys DeepDiff cannot express as a plain path; let it diff the whole document
+        out = {category: [] for category in _DIFF_CATEGORIES}
+        diff = DeepDiff(old_data or {}, new_data or {}, exclude_paths=["root['last_modified']"], **_DEEPDIFF_OPTIONS)
+        _add_deepdiff(out, diff, "root", new_data)
+    return [d for category in _DIFF_CATEGORIES for d in out[category]]
@@ -12,6 +12,7 @@ import sys
 from datetime import UTC, datetime
 
 import config
+import orjson
 
 DATA_DIR = config.DATA_DIR
 GAME_CONFIG_PATH = os.path.join(DATA_DIR, "game_config.json")
@@ -19,13 +20,14 @@ CHANGELOG_PATH = os.path.join(config.BASE_DIR, "CHANGELOG.md")
 
 
 def load_json(path):
-    with open(path, encoding="utf-8") as f:
-        return json.load(f)
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
 
 
 def save_json(path, data):
+    payload = json.dumps(data, indent=2)
     with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+        f.write(payload)
 
 
 def bump_version(current_version, bump_type):
@@ -1,16 +1,15 @@
-import json
 import os
 
+import orjson
+
 
 def load_json(path):
     """Safely loads a JSON file."""
-    if not os.path.exists(path):
+    try:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    except (FileNotFoundError, orjson.JSONDecodeError):
         return None
-    with open(path, encoding="utf-8") as f:
-        try:
-            return json.load(f)
-        except json.JSONDecodeError:
-            return None
 
 
 def load_timeline(entity_id: str, timeline_dir: str) -> list[dict]:
@@ -52,8 +51,12 @@ def extract_field(snapshot, dotted_path):
     Safely resolves a nested field path like 'abilities.primary.damage' from a snapshot.
     Returns None if any step in the path is missing.
     """
+    return _extract_parts(snapshot, dotted_path.split("."))
+
+
+def _extract_parts(snapshot, parts):
+    """extract_field for a path that has already been split on '.'."""
     current = snapshot
-    parts = dotted_path.split(".")
     for part in parts:
         if isinstance(current, dict) and part in current:
             current = current[part]
@@ -62,26 +65,31 @@ def extract_field(snapshot, dotted_path):
     return current
 
 
+def _tracked_values(snap, field_parts):
+    """Resolves every tracked field of a timeline entry's 'snapshot' payload, in order."""
+    data = snap.get("snapshot", {})
+    return [_extract_parts(data, parts) for parts in field_parts]
+
+
+def _changed_fields(tracked_fields, old_values, new_values):
+    return [
+        {"field": field, "old": old_val, "new": new_val}
+        for field, old_val, new_val in zip(tracked_fields, old_values, new_values, strict=True)
+        if old_val != new_val
+    ]
+
+
 def compute_stat_diff(old_snap, new_snap, tracked_fields):
     """
     Compares two snapshots based on a strict whitelist of tracked fields.
     Returns a list of dicts: [{'field': 'health', 'old': 100, 'new': 120}, ...]
     Omits fields that have not changed.
     """
-    changes = []
-
     # We diff the actual entity payload stored under 'snapshot' key
-    old_data = old_snap.get("snapshot", {})
-    new_data = new_snap.get("snapshot", {})
-
-    for field in tracked_fields:
-        old_val = extract_field(old_data, field)
-        new_val = extract_field(new_data, field)
-
-        if old_val != new_val:
-            changes.append({"field": field, "old": old_val, "new": new_val})
-
-    return changes
+    field_parts = [field.split(".") for field in tracked_fields]
+    return _changed_fields(
+        tracked_fields, _tracked_values(old_snap, field_parts), _tracked_values(new_snap, field_parts)
+    )
 
 
 def build_entity_stat_changes(entity_id, timeline_dir, tracked_fields):
@@ -94,14 +102,18 @@ def build_entity_stat_changes(entity_id, timeline_dir, tracked_fields):
     if not timeline or len(timeline) < 2:
         return []
 
+    # Resolve each version's tracked fields once; every version but the first and
+    # last takes part in two consecutive comparisons
+    field_parts = [field.split(".") for field in tracked_fields]
+    values = [_tracked_values(snap, field_parts) for snap in timeline]
+
     version_diffs = []
 
     # Compare consecutive pairs (start from second version)
     for i in range(1, len(timeline)):
-        old_snap = timeline[i - 1]
         new_snap = timeline[i]
 
-        changes = compute_stat_diff(old_snap, new_snap, tracked_fields)
+        changes = _changed_fields(tracked_fields, values[i - 1], values[i])
         if changes:
             version_diffs.append({"version": new_snap.get("version"), "date": new_snap.get("date"), "changes": changes})
 
@@ -14,6 +14,7 @@ import sys
 from pathlib import Path
 
 import config
+import orjson
 from PIL import Image
 
 # Try to import modern JSON schema libraries
@@ -44,8 +45,8 @@ CACHE_FILE = ".asset_cache.json"
 
 def load_json(filepath):
     try:
-        with open(filepath, encoding="utf-8") as f:
-            return json.load(f)
+        # Shares config's byte cache with build_api, which reloads the same files
+        return orjson.loads(config.read_json_bytes(filepath))
     except Exception as e:
         print(f"[FATAL] Could not load JSON {filepath}: {e}")
         return None
@@ -92,8 +93,8 @@ def load_cache():
     """Loads the asset validation cache."""
     if os.path.exists(CACHE_FILE):
         try:
-            with open(CACHE_FILE, encoding="utf-8") as f:
-                return json.load(f)
+            with open(CACHE_FILE, "rb") as f:
+                return orjson.loads(f.read())
         except Exception:
             return {}
     return {}
@@ -102,8 +103,9 @@ def load_cache():
 def save_cache(cache):
     """Saves the asset validation cache."""
     try:
+        payload = json.dumps(cache, indent=0)
         with open(CACHE_FILE, "w", encoding="utf-8") as f:
-            json.dump(cache, f, indent=0)
+            f.write(payload)
     except Exception as e:
         print(f"[WARN] Could not save cache: {e}")
 
@@ -5,11 +5,13 @@ Validates all JSON data files against schemas in `schemas/v2/` using standard
 `jsonschema` library. Does not perform cross-file referential integrity checks.
 """
 
-import json
 import os
 import sys
 from pathlib import Path
 
+import config
+import orjson
+
 try:
     from jsonschema import ValidationError, validators
     from referencing import Registry, Resource
@@ -17,14 +19,14 @@ except ImportError:
     print("CRITICAL: 'jsonschema' (>=4.18) or 'referencing' library not found.")
     sys.exit(1)
 
-PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DATA_DIR = os.path.join(PROJECT_ROOT, "data")
-SCHEMAS_DIR = os.path.join(PROJECT_ROOT, "schemas", "v2")
+PROJECT_ROOT = config.BASE_DIR
+DATA_DIR = config.DATA_DIR
+SCHEMAS_DIR = config.SCHEMAS_DIR
 
 
 def load_json(filepath):
-    with open(filepath, encoding="utf-8") as f:
-        return json.load(f)
+    with open(filepath, "rb") as f:
+        return orjson.loads(f.read())
 
 
 def create_registry(schemas_dir):
@@ -1,4 +1,6 @@
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch
 
 import build_api
@@ -42,6 +44,33 @@ class TestSanitizeRecursive:
         expected = ["safe", "&lt;i>italic&lt;/i>", ["&lt;nested>"]]
         assert build_api.sanitize_recursive(data) == expected
 
+    def test_clean_structure_returned_without_copy(self):
+        """Should return the original object when nothing needs escaping."""
+        data = {"name": "Ogre", "tags": ["melee", {"note": "5 > 3"}], "health": 100}
+        assert build_api.sanitize_recursive(data) is data
+
+    def test_sanitizes_in_place(self):
+        """Should rewrite strings inside the given containers rather than copying them."""
+        inner = ["<x>", "ok"]
+        data = {"clean": {"stats": [1, 2, 3]}, "dirty": inner}
+
+        result = build_api.sanitize_recursive(data)
+
+        assert result is data
+        assert result["dirty"] is inner
+        assert inner == ["&lt;x>", "ok"]
+
+    def test_shared_and_cyclic_references(self):
+        """Should escape a shared subtree once and terminate on self-references."""
+        shared = {"desc": "<b>"}
+        data = {"a": shared, "b": [shared]}
+        data["self"] = data
+
+        result = build_api.sanitize_recursive(data)
+
+        assert result["a"]["desc"] == "&lt;b>"
+        assert result["b"][0] is shared
+
     def test_evil_extreme_nesting(self):
         """Should handle extreme nesting depth up to recursion limit."""
         # Create a dict 500 levels deep
@@ -61,6 +90,31 @@ class TestSanitizeRecursive:
 
         assert res_current["unsafe"] == "&lt;evil>"
 
+    def test_load_sanitized_escapes_literal_and_unicode_escaped_lt(self, tmp_path):
+        """Should sanitize files containing `<` either literally or as a \\u003c escape."""
+        literal = tmp_path / "literal.json"
+        literal.write_bytes(b'{"desc": "<b>"}')
+        escaped = tmp_path / "escaped.json"
+        escaped.write_bytes(b'{"desc": "\\u003Cb>"}')
+
+        assert build_api.load_sanitized(str(literal)) == {"desc": "&lt;b>"}
+        assert build_api.load_sanitized(str(escaped)) == {"desc": "&lt;b>"}
+
+    def test_load_sanitized_skips_walk_for_clean_files(self, tmp_path):
+        """Should not walk data whose raw bytes contain no `<`."""
+        clean = tmp_path / "clean.json"
+        clean.write_bytes(b'{"desc": "a > b"}')
+
+        with patch("build_api.sanitize_recursive") as mock_sanitize:
+            assert build_api.load_sanitized(str(clean)) == {"desc": "a > b"}
+        mock_sanitize.assert_not_called()
+
+    def test_load_sanitized_returns_none_for_corrupt_file(self, tmp_path):
+        """Should return None for malformed JSON."""
+        bad = tmp_path / "bad.json"
+        bad.write_bytes(b"{nope")
+        assert build_api.load_sanitized(str(bad)) is None
+
 
 # ---------------------------------------------------------------------------
 # inject_hero_image_urls
@@ -102,6 +156,18 @@ class TestInjectHeroImageUrls:
         assert "defense" not in entity["image_urls"]
         assert "ultimate" not in entity["image_urls"]
 
+    def test_uses_prebuilt_asset_sets(self, tmp_path):
+        """Should resolve URLs from supplied name sets without touching the filesystem."""
+        entity = {"entity_id": "test_hero"}
+
+        with patch("config.ASSETS_DIR", str(tmp_path / "does_not_exist")):
+            build_api.inject_hero_image_urls(entity, {"test_hero.webp"}, {"test_hero_ultimate.webp"})
+
+        assert entity["image_urls"] == {
+            "card": "/assets/heroes/test_hero.webp",
+            "ultimate": "/assets/heroes/abilities/test_hero_ultimate.webp",
+        }
+
 
 # ---------------------------------------------------------------------------
 # inject_map_image_url
@@ -201,6 +267,46 @@ class TestFileOperations:
             loaded = json.load(f)
             assert loaded == data
 
+    def test_submit_save_json_writes_on_pool(self, tmp_path, capsys):
+        """Should return the payload immediately and log only once the pool has written it."""
+        output_dir = tmp_path / "api_out"
+        output_dir.mkdir()
+
+        with patch("build_api.OUTPUT_DIR", str(output_dir)), ThreadPoolExecutor(max_workers=1) as writer:
+            payload, write = build_api.submit_save_json(writer, "test.json", [{"id": 1}])
+            write.result()
+
+        assert (output_dir / "test.json").read_bytes() == payload
+        assert "[OK] Generated" in capsys.readouterr().out
+        assert json.loads(payload) == [{"id": 1}]
+
+    def test_streamed_all_data_matches_single_dump(self, tmp_path):
+        """Members written one at a time should equal one indent=2 dump of the whole object."""
+        members = {"build_info": {"version": "1.0.0"}, "units": [{"id": 1, "tags": ["a", "b"]}], "empty": []}
+        out = tmp_path / "all_data.json"
+
+        with patch("build_api.PRETTY", True), open(out, "wb") as fh:
+            fh.write(b"{")
+            for i, (key, value) in enumerate(members.items()):
+                payload = json.dumps(value, indent=2).encode()
+                build_api.write_all_data_member(fh, key, payload, first=i == 0)
+            fh.write(b"\n}")
+
+        assert out.read_text(encoding="utf-8") == json.dumps(members, indent=2)
+
+    def test_streamed_all_data_compact(self, tmp_path):
+        """Compact mode should produce the same bytes as one compact dump of the whole object."""
+        members = {"build_info": {"version": "1.0.0"}, "units": [{"id": 1, "tags": ["a", "b"]}], "empty": []}
+        out = tmp_path / "all_data.json"
+
+        with patch("build_api.PRETTY", False), open(out, "wb") as fh:
+            fh.write(b"{")
+            for i, (key, value) in enumerate(members.items()):
+                build_api.write_all_data_member(fh, key, build_api.dump_json(value), first=i == 0)
+            fh.write(b"}")
+
+        assert out.read_text(encoding="utf-8") == json.dumps(members, separators=(",", ":"))
+
     def test_evil_save_invalid_json_types(self, tmp_path):
         """Should crash on non-serializable objects (expected behavior of json.dump)."""
         output_dir = tmp_path / "api_out"
@@ -249,6 +355,31 @@ class TestBuildPatchHistory:
         assert (out_dir / "timeline" / "snap2.json").exists()
         assert not (out_dir / "timeline" / ".gitkeep").exists()
 
+    def test_copy_many_preserves_content_and_mtime(self, tmp_path):
+        """Should copy bytes exactly and carry over the source mtime."""
+        src = tmp_path / "src.json"
+        src.write_bytes(b'{"snapshot": true}' * 5000)
+        os.utime(src, ns=(1_000_000_000, 2_000_000_000))
+        dst = tmp_path / "dst.json"
+
+        build_api._copy_many([(str(src), str(dst), None)])
+
+        assert dst.read_bytes() == src.read_bytes()
+        assert os.stat(dst).st_mtime_ns == 2_000_000_000
+
+    def test_copy_many_copies_every_job(self, tmp_path):
+        """Should copy each (src, dst) job and report how many were copied."""
+        jobs = []
+        for i in range(5):
+            src = tmp_path / f"src_{i}.json"
+            src.write_text(f'{{"i": {i}}}')
+            jobs.append((str(src), str(tmp_path / f"dst_{i}.json"), None))
+
+        assert build_api._copy_many(jobs) == 5
+        assert build_api._copy_many([]) == 0
+        for i in range(5):
+            assert (tmp_path / f"dst_{i}.json").read_text() == f'{{"i": {i}}}'
+
     def test_evil_missing_history_directories(self, tmp_path):
         """Should not crash if source files or directories are completely missing."""
         root_dir = tmp_path / "empty_root"
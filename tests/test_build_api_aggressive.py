@@ -327,3 +327,77 @@ class TestStatusJson:
             assert key in status, f"Missing key '{key}' in status.json"
 
         assert "1.2.3" in status["valid_versions"]
+
+
+# ---------------------------------------------------------------------------
+# main — input fingerprint cache
+# ---------------------------------------------------------------------------
+
+
+class TestBuildCache:
+    def _run(self, tmp_path, output, data_root):
+        import config as cfg
+
+        with (
+            patch("build_api.OUTPUT_DIR", output),
+            patch("build_api.DATA_DIR", str(data_root)),
+            patch.object(cfg, "OUTPUT_DIR", output),
+            patch.object(cfg, "DATA_DIR", str(data_root)),
+            patch.object(cfg, "BASE_DIR", str(tmp_path)),
+            patch.object(cfg, "PATCH_HISTORY_FILES", []),
+            patch.object(cfg, "PATCH_HISTORY_DIR", "timeline"),
+            patch("build_api.validate_integrity"),
+            patch("build_api.save_json", wraps=build_api.save_json) as spy,
+        ):
+            build_api.main()
+        return spy.call_count
+
+    def test_skips_unchanged_inputs_and_rebuilds_on_change(self, tmp_path):
+        output = str(tmp_path / "api")
+        data_root = tmp_path / "data"
+        (data_root / "units").mkdir(parents=True)
+        unit = data_root / "units" / "u.json"
+        unit.write_text('{"entity_id": "u"}', encoding="utf-8")
+        (data_root / "game_config.json").write_text('{"version": "1.0.0"}', encoding="utf-8")
+
+        assert self._run(tmp_path, output, data_root) > 0
+        assert self._run(tmp_path, output, data_root) == 0
+
+        unit.write_text('{"entity_id": "u", "health": 5}', encoding="utf-8")
+        assert self._run(tmp_path, output, data_root) > 0
+
+    def test_rebuilds_when_an_output_is_deleted_or_edited(self, tmp_path):
+        output = str(tmp_path / "api")
+        data_root = tmp_path / "data"
+        (data_root / "units").mkdir(parents=True)
+        (data_root / "units" / "u.json").write_text('{"entity_id": "u"}', encoding="utf-8")
+        (data_root / "game_config.json").write_text('{"version": "1.0.0"}', encoding="utf-8")
+
+        self._run(tmp_path, output, data_root)
+        os.remove(os.path.join(output, "status.json"))
+        assert self._run(tmp_path, output, data_root) > 0
+        assert os.path.exists(os.path.join(output, "status.json"))
+
+        with open(os.path.join(output, "units.json"), "a", encoding="utf-8") as f:
+            f.write(" ")
+        assert self._run(tmp_path, output, data_root) > 0
+
+    def test_cache_is_kept_with_the_output_dir(self, tmp_path):
+        output = str(tmp_path / "api")
+        data_root = tmp_path / "data"
+        data_root.mkdir()
+        (data_root / "game_config.json").write_text('{"version": "1.0.0"}', encoding="utf-8")
+
+        self._run(tmp_path, output, data_root)
+        assert os.path.exists(os.path.join(output, build_api.BUILD_CACHE_FILE))
+        assert not (tmp_path / build_api.BUILD_CACHE_FILE).exists()
+
+    def test_build_force_ignores_cache(self, tmp_path):
+        output = str(tmp_path / "api")
+        data_root = tmp_path / "data"
+        data_root.mkdir()
+        (data_root / "game_config.json").write_text('{"version": "1.0.0"}', encoding="utf-8")
+
+        self._run(tmp_path, output, data_root)
+        with patch.dict(os.environ, {"BUILD_FORCE": "1"}):
+            assert self._run(tmp_path, output, data_root) > 0
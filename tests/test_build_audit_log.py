@@ -2,15 +2,20 @@ import json
 from unittest.mock import mock_open, patch
 
 import build_audit_log
+import pytest
 
 # Sample mocked git log output
-MOCKED_GIT_LOG = """COMMIT|commit3_delete|2023-01-03T12:00:00Z|Dev|Delete skeleton
-D\tdata/units/skeleton.json
+SHA_A, SHA_B = "a" * 40, "b" * 40
+NULL_SHA = "0" * 40
+
+# Sample mocked `git log --raw --no-abbrev` output
+MOCKED_GIT_LOG = f"""COMMIT|commit3_delete|2023-01-03T12:00:00Z|Dev|Delete skeleton
+:100644 000000 {SHA_B} {NULL_SHA} D\tdata/units/skeleton.json
 COMMIT|commit2_edit|2023-01-02T12:00:00Z|Dev|Update skeleton
-M\tdata/units/skeleton.json
-A\tdata/spells/fireball.json
+:100644 100644 {SHA_A} {SHA_B} M\tdata/units/skeleton.json
+:000000 100644 {NULL_SHA} {SHA_A} A\tdata/spells/fireball.json
 COMMIT|commit1_add_first|2023-01-01T12:00:00Z|Dev|Initial commit
-A\tdata/units/skeleton.json
+:000000 100644 {NULL_SHA} {SHA_A} A\tdata/units/skeleton.json
 """
 
 
@@ -39,16 +44,64 @@ def test_parse_git_log(mock_run):
     assert len(commits[1]["files"]) == 2
     assert commits[1]["files"][0] == ("M", "data/units/skeleton.json")
     assert commits[1]["files"][1] == ("A", "data/spells/fireball.json")
+    assert commits[1]["blobs"]["data/units/skeleton.json"] == (SHA_A, SHA_B)
 
     # First commit
     assert commits[2]["commit"] == "commit1_add_first"
     assert len(commits[2]["files"]) == 1
 
 
+@patch("subprocess.run")
+def test_parse_git_log_bounded(mock_run):
+    """since / max_commits are passed to git log ahead of the pathspec."""
+
+    class MockProcess:
+        stdout = MOCKED_GIT_LOG
+
+    mock_run.return_value = MockProcess()
+
+    build_audit_log.parse_git_log(since="2 weeks ago", max_commits="5")
+
+    cmd = mock_run.call_args.args[0]
+    assert "--since=2 weeks ago" in cmd
+    assert "--max-count=5" in cmd
+    assert cmd[-2:] == ["--", "data/"]
+
+
+@patch("build_audit_log.get_blob_content")
+@patch("subprocess.run")
+def test_parse_git_log_raw_blobs(mock_run, mock_get_blob):
+    """Raw log lines carry blob SHAs, which are used to read file contents directly."""
+    old_sha, new_sha = "a" * 40, "b" * 40
+
+    class MockProcess:
+        stdout = (
+            "COMMIT|c1|2023-01-01T12:00:00Z|Dev|Tweak\n"
+            f":100644 100644 {old_sha} {new_sha} M\tdata/units/ogre.json\n"
+            f":000000 100644 {'0' * 40} {new_sha} A\tdata/units/readme.txt\n"
+        )
+
+    mock_run.return_value = MockProcess()
+
+    commits = build_audit_log.parse_git_log()
+
+    assert commits[0]["files"] == [("M", "data/units/ogre.json")]
+    assert commits[0]["blobs"] == {"data/units/ogre.json": (old_sha, new_sha)}
+
+    mock_get_blob.side_effect = lambda sha: {"hp": 1} if sha == old_sha else {"hp": 2}
+    change = build_audit_log._diff_one(("c1", "M", "data/units/ogre.json", (old_sha, new_sha)))
+
+    assert change["entity_id"] == "ogre"
+    assert change["change_type"] == "edit"
+    assert change["diffs"]
+
+
+@patch("build_audit_log.save_audit_meta")
+@patch("os.replace")
 @patch("build_audit_log.parse_git_log")
 @patch("build_audit_log.get_file_content_at_commit")
 @patch("builtins.open", new_callable=mock_open)
-def test_build_audit_log_end_to_end(mock_file, mock_get_content, mock_parse):
+def test_build_audit_log_end_to_end(mock_file, mock_get_content, mock_parse, _replace, _save_meta):
     """Verifies that build_audit_log orchestrates diffing and outputs correctly."""
 
     # Setup the mock parsed commits (already tested above)
@@ -107,7 +160,7 @@ def test_build_audit_log_end_to_end(mock_file, mock_get_content, mock_parse):
     build_audit_log.build_audit_log()
 
     # Capture what was written to the file
-    written_data = "".join(call.args[0] for call in mock_file().write.call_args_list)
+    written_data = b"".join(call.args[0] for call in mock_file().write.call_args_list)
     audit_json = json.loads(written_data)
 
     assert len(audit_json) == 3
@@ -159,3 +212,94 @@ def test_is_entity_file_exclusions():
 
     # Root data folder files (even if JSON)
     assert build_audit_log.is_entity_file("data/something.json") is False
+
+
+@patch("build_audit_log.parse_git_log")
+@patch("build_audit_log.get_file_content_at_commit")
+def test_build_audit_log_reuses_existing_entries(mock_get_content, mock_parse, tmp_path):
+    """Commits already present in audit.json should be reused without re-diffing."""
+    cached_entry = {
+        "commit": "old",
+        "timestamp": "t0",
+        "author": "Dev",
+        "message": "Old",
+        "changes": [{"cached": True}],
+    }
+    (tmp_path / "audit.json").write_text(json.dumps([cached_entry]), encoding="utf-8")
+    build_audit_log.save_audit_meta(str(tmp_path / ".audit_cache.json"), set())
+
+    mock_parse.return_value = [
+        {"commit": "new", "timestamp": "t1", "author": "Dev", "message": "New", "files": [("A", "data/units/a.json")]},
+        {"commit": "old", "timestamp": "t0", "author": "Dev", "message": "Old", "files": [("M", "data/units/a.json")]},
+    ]
+    mock_get_content.return_value = {"health": 1}
+
+    with patch("config.BASE_DIR", str(tmp_path)):
+        build_audit_log.build_audit_log()
+
+    audit_json = json.loads((tmp_path / "audit.json").read_text(encoding="utf-8"))
+    assert [entry["commit"] for entry in audit_json] == ["new", "old"]
+    assert audit_json[1] == cached_entry
+    # Only the new commit's added file was fetched
+    mock_get_content.assert_called_once_with("data/units/a.json", "new")
+
+
+@patch("build_audit_log.parse_git_log")
+@patch("build_audit_log.get_file_content_at_commit")
+def test_build_audit_log_recomputes_stale_format(mock_get_content, mock_parse, tmp_path):
+    """Entries written by another format version (or without a sidecar) must not be reused."""
+    stale_entry = {"commit": "old", "timestamp": "t0", "author": "Dev", "message": "Old", "changes": [{"stale": True}]}
+    (tmp_path / "audit.json").write_text(json.dumps([stale_entry]), encoding="utf-8")
+    (tmp_path / ".audit_cache.json").write_text('{"version": 0, "empty_commits": []}', encoding="utf-8")
+
+    mock_parse.return_value = [
+        {"commit": "old", "timestamp": "t0", "author": "Dev", "message": "Old", "files": [("A", "data/units/a.json")]},
+    ]
+    mock_get_content.return_value = {"health": 1}
+
+    with patch("config.BASE_DIR", str(tmp_path)):
+        build_audit_log.build_audit_log()
+
+    audit_json = json.loads((tmp_path / "audit.json").read_text(encoding="utf-8"))
+    assert audit_json[0]["changes"][0]["change_type"] == "add"
+    meta = json.loads((tmp_path / ".audit_cache.json").read_text(encoding="utf-8"))
+    assert meta["version"] == build_audit_log.AUDIT_FORMAT_VERSION
+
+
+@patch("build_audit_log.parse_git_log")
+@patch("build_audit_log.get_file_content_at_commit")
+def test_build_audit_log_caches_commits_without_changes(mock_get_content, mock_parse, tmp_path):
+    """A commit whose files produce no entity changes should not be diffed again next run."""
+    mock_parse.return_value = [
+        {"commit": "noop", "timestamp": "t0", "author": "Dev", "message": "Fmt", "files": [("M", "data/units/a.json")]},
+    ]
+    mock_get_content.return_value = {"health": 1}
+
+    with patch("config.BASE_DIR", str(tmp_path)):
+        build_audit_log.build_audit_log()
+        assert mock_get_content.call_count == 2
+        build_audit_log.build_audit_log()
+
+    assert mock_get_content.call_count == 2
+    assert json.loads((tmp_path / "audit.json").read_text(encoding="utf-8")) == []
+    meta = json.loads((tmp_path / ".audit_cache.json").read_text(encoding="utf-8"))
+    assert meta["empty_commits"] == ["noop"]
+
+
+@patch("build_audit_log.parse_git_log")
+@patch("build_audit_log.get_file_content_at_commit")
+def test_build_audit_log_keeps_previous_file_on_failure(mock_get_content, mock_parse, tmp_path):
+    """A run that fails midway must leave the previous audit.json untouched."""
+    previous = '[{"commit": "old", "timestamp": "t0", "author": "Dev", "message": "Old", "changes": []}]'
+    (tmp_path / "audit.json").write_text(previous, encoding="utf-8")
+
+    mock_parse.return_value = [
+        {"commit": "new", "timestamp": "t1", "author": "Dev", "message": "New", "files": [("A", "data/units/a.json")]},
+    ]
+    mock_get_content.side_effect = RuntimeError("git died")
+
+    with patch("config.BASE_DIR", str(tmp_path)), pytest.raises(RuntimeError):
+        build_audit_log.build_audit_log()
+
+    assert (tmp_path / "audit.json").read_text(encoding="utf-8") == previous
+    assert not (tmp_path / "audit.json.tmp").exists()
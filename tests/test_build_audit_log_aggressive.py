@@ -1,7 +1,7 @@
 """
 Aggressive tests for build_audit_log.py
 
-Covers: rename/type-change handling, dual-None entity skip, missing git commit
+Covers: edit/type-change handling, dual-None entity skip, missing git commit
 errors, git log format edge cases, empty-commit filtering, and output file
 structure.
 """
@@ -12,6 +12,9 @@ from unittest.mock import mock_open, patch
 
 import build_audit_log
 
+SHA_A, SHA_B = "a" * 40, "b" * 40
+NULL_SHA = "0" * 40
+
 # ---------------------------------------------------------------------------
 # is_entity_file — exhaustive boundary cases
 # ---------------------------------------------------------------------------
@@ -53,17 +56,18 @@ class TestIsEntityFileAggressive:
 
 
 # ---------------------------------------------------------------------------
-# parse_git_log — rename handling and edge cases
+# parse_git_log — renames and edge cases
 # ---------------------------------------------------------------------------
 
 
 class TestParseGitLogAggressive:
     @patch("subprocess.run")
-    def test_rename_entry_is_included(self, mock_run):
-        """A Rxx rename status line should be captured as a file change."""
-        log = """\
+    def test_rename_is_reported_as_delete_and_add(self, mock_run):
+        """With --no-renames git lists a rename as a delete of the old path plus an add of the new one."""
+        log = f"""\
 COMMIT|ren_commit|2024-01-01T00:00:00Z|Dev|Rename unit
-R100\tdata/units/old_name.json\tdata/units/new_name.json
+:100644 000000 {SHA_A} {NULL_SHA} D\tdata/units/old_name.json
+:000000 100644 {NULL_SHA} {SHA_A} A\tdata/units/new_name.json
 """
 
         class MockProc:
@@ -72,9 +76,7 @@ R100\tdata/units/old_name.json\tdata/units/new_name.json
         mock_run.return_value = MockProc()
         commits = build_audit_log.parse_git_log()
         assert len(commits) == 1
-        # The last path token is what we care about, matching is_entity_file
-        statuses = [f[0] for f in commits[0]["files"]]
-        assert any("R" in s for s in statuses)
+        assert commits[0]["files"] == [("D", "data/units/old_name.json"), ("A", "data/units/new_name.json")]
 
     @patch("subprocess.run")
     def test_empty_log_returns_empty_list(self, mock_run):
@@ -87,9 +89,9 @@ R100\tdata/units/old_name.json\tdata/units/new_name.json
     @patch("subprocess.run")
     def test_commit_with_no_entity_files_is_filtered(self, mock_run):
         """A commit that only touches non-entity files should not appear."""
-        log = """\
+        log = f"""\
 COMMIT|abc123|2024-01-01T00:00:00Z|Dev|Change config only
-M\tdata/game_config.json
+:100644 100644 {SHA_A} {SHA_B} M\tdata/game_config.json
 """
 
         class MockProc:
@@ -108,9 +110,9 @@ M\tdata/game_config.json
     @patch("subprocess.run")
     def test_malformed_commit_line_is_ignored(self, mock_run):
         """A COMMIT line with fewer than 5 pipe-delimited fields should be skipped."""
-        log = """\
+        log = f"""\
 COMMIT|short|line
-M\tdata/units/ogre.json
+:100644 100644 {SHA_A} {SHA_B} M\tdata/units/ogre.json
 """
 
         class MockProc:
@@ -127,38 +129,42 @@ M\tdata/units/ogre.json
 
 
 class TestBuildAuditLogLogic:
+    @patch("build_audit_log.save_audit_meta")
+    @patch("os.replace")
     @patch("build_audit_log.parse_git_log")
     @patch("build_audit_log.get_file_content_at_commit")
     @patch("builtins.open", new_callable=mock_open)
-    def test_rename_treated_as_rename_type(self, mock_file, mock_get_content, mock_parse):
-        """A file with R status should produce change_type='rename'."""
+    def test_modified_file_is_edit_type(self, mock_file, mock_get_content, mock_parse, _replace, _save_meta):
+        """With --no-renames every two-sided change is an M, reported as change_type='edit'."""
         mock_parse.return_value = [
             {
-                "commit": "ren_hash",
+                "commit": "edit_hash",
                 "timestamp": "2024-01-01T00:00:00Z",
                 "author": "Dev",
-                "message": "Rename",
-                "files": [("R100", "data/units/new_name.json")],
+                "message": "Rebalance",
+                "files": [("M", "data/units/ogre.json")],
             }
         ]
 
         def content_side_effect(filepath, commit):
-            if "ren_hash~1" in commit:
-                return {"name": "Old Name", "health": 100}
-            return {"name": "New Name", "health": 100}
+            if "edit_hash~1" in commit:
+                return {"name": "Ogre", "health": 100}
+            return {"name": "Ogre", "health": 120}
 
         mock_get_content.side_effect = content_side_effect
 
         build_audit_log.build_audit_log()
 
-        written = "".join(c.args[0] for c in mock_file().write.call_args_list)
+        written = b"".join(c.args[0] for c in mock_file().write.call_args_list)
         data = json.loads(written)
-        assert data[0]["changes"][0]["change_type"] == "rename"
+        assert data[0]["changes"][0]["change_type"] == "edit"
 
+    @patch("build_audit_log.save_audit_meta")
+    @patch("os.replace")
     @patch("build_audit_log.parse_git_log")
     @patch("build_audit_log.get_file_content_at_commit")
     @patch("builtins.open", new_callable=mock_open)
-    def test_both_none_content_is_skipped(self, mock_file, mock_get_content, mock_parse):
+    def test_both_none_content_is_skipped(self, mock_file, mock_get_content, mock_parse, _replace, _save_meta):
         """If both old and new content are None, that entity should not appear in the output."""
         mock_parse.return_value = [
             {
@@ -173,15 +179,17 @@ class TestBuildAuditLogLogic:
 
         build_audit_log.build_audit_log()
 
-        written = "".join(c.args[0] for c in mock_file().write.call_args_list)
+        written = b"".join(c.args[0] for c in mock_file().write.call_args_list)
         data = json.loads(written)
         # Ghost entity should produce 0 audit entries (no valid diff)
         assert data == []
 
+    @patch("build_audit_log.save_audit_meta")
+    @patch("os.replace")
     @patch("build_audit_log.parse_git_log")
     @patch("build_audit_log.get_file_content_at_commit")
     @patch("builtins.open", new_callable=mock_open)
-    def test_output_json_is_minified(self, mock_file, mock_get_content, mock_parse):
+    def test_output_json_is_minified(self, mock_file, mock_get_content, mock_parse, _replace, _save_meta):
         """Output JSON should be compact (separators=(',', ':')) to save space."""
         mock_parse.return_value = [
             {
@@ -196,14 +204,16 @@ class TestBuildAuditLogLogic:
 
         build_audit_log.build_audit_log()
 
-        written = "".join(c.args[0] for c in mock_file().write.call_args_list)
+        written = b"".join(c.args[0] for c in mock_file().write.call_args_list)
         # Minified JSON has no spaces after : or ,
-        assert ": " not in written, "Output JSON should be minified, not pretty-printed"
+        assert b": " not in written, "Output JSON should be minified, not pretty-printed"
 
+    @patch("build_audit_log.save_audit_meta")
+    @patch("os.replace")
     @patch("build_audit_log.parse_git_log")
     @patch("build_audit_log.get_file_content_at_commit")
     @patch("builtins.open", new_callable=mock_open)
-    def test_audit_entry_contains_required_fields(self, mock_file, mock_get_content, mock_parse):
+    def test_audit_entry_contains_required_fields(self, mock_file, mock_get_content, mock_parse, _replace, _save_meta):
         """Every audit entry must contain commit, timestamp, author, message, changes."""
         mock_parse.return_value = [
             {
@@ -223,17 +233,19 @@ class TestBuildAuditLogLogic:
         mock_get_content.side_effect = content
         build_audit_log.build_audit_log()
 
-        written = "".join(c.args[0] for c in mock_file().write.call_args_list)
+        written = b"".join(c.args[0] for c in mock_file().write.call_args_list)
         data = json.loads(written)
         entry = data[0]
 
         for field in ("commit", "timestamp", "author", "message", "changes"):
             assert field in entry, f"Required field '{field}' missing from audit entry"
 
+    @patch("build_audit_log.save_audit_meta")
+    @patch("os.replace")
     @patch("build_audit_log.parse_git_log")
     @patch("build_audit_log.get_file_content_at_commit")
     @patch("builtins.open", new_callable=mock_open)
-    def test_change_entry_contains_required_fields(self, mock_file, mock_get_content, mock_parse):
+    def test_change_entry_contains_required_fields(self, mock_file, mock_get_content, mock_parse, _replace, _save_meta):
         """Each change inside an entry must have entity_id, file, category, change_type, diffs."""
         mock_parse.return_value = [
             {
@@ -251,7 +263,7 @@ class TestBuildAuditLogLogic:
         mock_get_content.side_effect = content
         build_audit_log.build_audit_log()
 
-        written = "".join(c.args[0] for c in mock_file().write.call_args_list)
+        written = b"".join(c.args[0] for c in mock_file().write.call_args_list)
         data = json.loads(written)
         change = data[0]["changes"][0]
 
@@ -1,10 +1,11 @@
 """
 Unit tests for config.py
 
-Tests the shared load_json utility function with various edge cases.
+Tests the shared load_json, read_json_bytes and iter_json_files helpers with various edge cases.
 """
 
 import json
+import os
 
 import config
 
@@ -37,3 +38,70 @@ class TestLoadJson:
         f.write_text(json.dumps([1, 2, 3]), encoding="utf-8")
         result = config.load_json(str(f))
         assert result == [1, 2, 3]
+
+    def test_repeat_loads_return_independent_objects(self, tmp_path):
+        """Cached reads must not leak mutations between callers."""
+        f = tmp_path / "shared.json"
+        f.write_text(json.dumps({"tags": ["a"]}), encoding="utf-8")
+        first = config.load_json(str(f))
+        first["tags"].append("mutated")
+        assert config.load_json(str(f)) == {"tags": ["a"]}
+
+    def test_sees_edits_to_cached_file(self, tmp_path):
+        """Should re-read a file whose contents changed since the last load."""
+        f = tmp_path / "edited.json"
+        f.write_text(json.dumps({"v": 1}), encoding="utf-8")
+        assert config.load_json(str(f)) == {"v": 1}
+        f.write_text(json.dumps({"v": 22}), encoding="utf-8")
+        os.utime(f, ns=(0, 1))
+        assert config.load_json(str(f)) == {"v": 22}
+
+    def test_sees_same_size_rewrite_within_one_mtime_tick(self, tmp_path):
+        """A same-size rewrite that keeps the old mtime must still be re-read."""
+        f = tmp_path / "tick.json"
+        f.write_text(json.dumps({"v": 1}), encoding="utf-8")
+        st = os.stat(f)
+        assert config.load_json(str(f)) == {"v": 1}
+        f.write_text(json.dumps({"v": 2}), encoding="utf-8")
+        os.utime(f, ns=(st.st_atime_ns, st.st_mtime_ns))
+        assert os.stat(f).st_size == st.st_size
+        assert config.load_json(str(f)) == {"v": 2}
+
+    def test_read_json_bytes_shared_with_load_json(self, tmp_path):
+        """Raw bytes should come from the same cache load_json reads through."""
+        f = tmp_path / "shared_bytes.json"
+        f.write_bytes(b'{"k": 1}')
+        config.load_json(str(f))
+        hits = config._read_bytes_cached.cache_info().hits
+        assert config.read_json_bytes(str(f)) == b'{"k": 1}'
+        assert config._read_bytes_cached.cache_info().hits == hits + 1
+
+
+class TestIterJsonFiles:
+    """Tests for the scandir-based JSON file walker."""
+
+    def test_recursive_walk_filters_by_suffix(self, tmp_path):
+        """Should yield matching files from nested directories only."""
+        (tmp_path / "a.schema.json").write_text("{}", encoding="utf-8")
+        (tmp_path / "b.json").write_text("{}", encoding="utf-8")
+        nested = tmp_path / "definitions"
+        nested.mkdir()
+        (nested / "c.schema.json").write_text("{}", encoding="utf-8")
+
+        result = sorted(config.iter_json_files(str(tmp_path), ".schema.json"))
+        assert result == [str(tmp_path / "a.schema.json"), str(nested / "c.schema.json")]
+
+    def test_non_recursive_and_dotfiles(self, tmp_path):
+        """Should ignore subdirectories when not recursive, and always skip dotfiles."""
+        (tmp_path / "unit.json").write_text("{}", encoding="utf-8")
+        (tmp_path / ".hidden.json").write_text("{}", encoding="utf-8")
+        nested = tmp_path / "sub"
+        nested.mkdir()
+        (nested / "deep.json").write_text("{}", encoding="utf-8")
+
+        result = list(config.iter_json_files(str(tmp_path), recursive=False))
+        assert result == [str(tmp_path / "unit.json")]
+
+    def test_missing_directory_yields_nothing(self, tmp_path):
+        """Should not raise for a directory that doesn't exist."""
+        assert list(config.iter_json_files(str(tmp_path / "missing"))) == []
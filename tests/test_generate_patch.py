@@ -169,3 +169,60 @@ class TestDiscoverVersionBoundaries:
         boundaries = generate_patch.discover_version_boundaries("0.0.1")
         assert len(boundaries) == 1
         assert boundaries[0] == {"version": "0.0.1", "commit": "commit1"}
+
+    @patch("subprocess.run")
+    def test_stops_once_wanted_versions_found(self, mock_run):
+        log_result = MagicMock()
+        log_result.stdout = "commit1\ncommit2\n"
+
+        show1_result = MagicMock()
+        show1_result.stdout = '{"version": "0.0.1"}'
+
+        mock_run.side_effect = [log_result, show1_result]
+
+        boundaries = generate_patch.discover_version_boundaries("1.0.0", {"0.0.1"})
+        assert boundaries == [{"version": "0.0.1", "commit": "commit1"}]
+        assert mock_run.call_count == 2  # commit2's game_config.json is never read
+
+
+class TestReadConfigVersion:
+    @patch("generate_patch.get_file_content_at_commit")
+    @patch("generate_patch.read_file_at_commit")
+    def test_reads_top_level_version_without_parsing(self, mock_read, mock_get):
+        mock_read.return_value = (
+            b'{\n  "name": "Game",\n  "version": "0.2.0",\n  "changelog": [\n'
+            b'    {\n      "version": "0.1.0"\n    }\n  ]\n}\n'
+        )
+        assert generate_patch.read_config_version("c1") == "0.2.0"
+        mock_get.assert_not_called()
+
+    @patch("generate_patch.get_file_content_at_commit", return_value={"version": "0.3.0"})
+    @patch("generate_patch.read_file_at_commit", return_value=b'{"version": "0.3.0"}')
+    def test_falls_back_to_full_parse_for_other_formatting(self, _read, mock_get):
+        assert generate_patch.read_config_version("c1") == "0.3.0"
+        mock_get.assert_called_once_with("data/game_config.json", "c1")
+
+
+# ---------------------------------------------------------------------------
+# main — git reads share one batch reader
+# ---------------------------------------------------------------------------
+
+
+class TestMain:
+    @patch("generate_patch.generate_patches")
+    @patch("generate_patch.batch_reader")
+    @patch("generate_patch.load_json", return_value={"version": "0.0.2"})
+    @patch("os.path.exists", return_value=True)
+    def test_runs_inside_batch_reader(self, _exists, _load, mock_reader, mock_generate):
+        generate_patch.main()
+
+        mock_reader.return_value.__enter__.assert_called_once()
+        mock_generate.assert_called_once_with({"version": "0.0.2"})
+
+
+class TestVersionAheadOf:
+    def test_compares_against_parsed_current(self):
+        is_ahead = generate_patch.version_ahead_of("0.1.10")
+        assert is_ahead("0.2.0")
+        assert not is_ahead("0.1.9")  # numeric, not string, ordering
+        assert not is_ahead("0.1.10")
@@ -14,6 +14,7 @@ Simulated history:
   0.0.1 (baseline) → 0.0.2 (skeleton buffed) → 0.0.3 (fireball added, skeleton nerfed)
 """
 
+import contextlib
 import json
 import os
 from unittest.mock import MagicMock, patch
@@ -196,6 +197,8 @@ class TestMainPipelineContract:
 
         with (
             patch("subprocess.run", side_effect=router),
+            # Route blob reads through the mocked `git show` fallback instead of a real cat-file process
+            patch("generate_patch.batch_reader", return_value=contextlib.nullcontext()),
             patch.object(generate_patch, "GAME_CONFIG_PATH", pipeline_env["game_config_path"]),
             patch.object(generate_patch, "PATCHES_FILE", pipeline_env["patches_path"]),
             patch.object(generate_patch, "TIMELINE_DIR", pipeline_env["timeline_dir"]),
@@ -377,6 +380,7 @@ class TestMainPipelineEdgeCases:
 
         with (
             patch("subprocess.run", side_effect=router),
+            patch("generate_patch.batch_reader", return_value=contextlib.nullcontext()),
             patch.object(generate_patch, "GAME_CONFIG_PATH", str(game_config_path)),
             patch.object(generate_patch, "PATCHES_FILE", str(patches_path)),
             patch.object(generate_patch, "TIMELINE_DIR", str(timeline_dir)),
@@ -418,6 +422,7 @@ class TestMainPipelineEdgeCases:
 
         with (
             patch("subprocess.run", side_effect=router),
+            patch("generate_patch.batch_reader", return_value=contextlib.nullcontext()),
             patch.object(generate_patch, "GAME_CONFIG_PATH", str(game_config_path)),
             patch.object(generate_patch, "PATCHES_FILE", str(patches_path)),
             patch.object(generate_patch, "TIMELINE_DIR", str(timeline_dir)),
@@ -1,10 +1,11 @@
 """
 Aggressive tests for patch_utils.py
 
-Covers: compute_diff, _parse_deepdiff_path, get_file_content_at_commit,
+Covers: compute_diff, _parse_deepdiff_path, get_file_content_at_commit, batch_reader,
 load_json, save_json — including every diff category, edge cases, and error paths.
 """
 
+import io
 import json
 import os
 import subprocess
@@ -39,6 +40,10 @@ class TestParseDeepdiffPath:
         result = patch_utils._parse_deepdiff_path("root['list'][99]")
         assert result == ["list", 99]
 
+    def test_double_quoted_key(self):
+        # DeepDiff switches to double quotes for keys containing an apostrophe
+        assert patch_utils._parse_deepdiff_path("""root["it's"][0]""") == ["it's", 0]
+
 
 # ---------------------------------------------------------------------------
 # compute_diff — pure function (via patch_utils, not generate_patch)
@@ -112,6 +117,29 @@ class TestComputeDiff:
         diffs = patch_utils.compute_diff(old, new)
         assert diffs == [], "last_modified change must produce no diffs"
 
+    def test_list_items_pair_up_ignoring_nested_last_modified(self):
+        """last_modified inside list items does not count when matching old and new items."""
+        old = {"items": ["t", {"name": "ogre", "hp": 5, "last_modified": None}]}
+        new = {"items": ["t", -1, {"name": "ogre", "last_modified": [1, 2]}]}
+        assert patch_utils.compute_diff(old, new) == [
+            {"path": ["items", 1, "hp"], "removed": True},
+            {"path": ["items", 1, "last_modified"], "old_value": None, "new_value": [1, 2]},
+            {"path": ["items", 1], "new_value": -1},
+        ]
+
+    def test_added_key_inside_list_item_resolves_value(self):
+        old = {"abilities": [{"name": "smash"}]}
+        new = {"abilities": [{"name": "smash", "it's": {"damage": 5}}]}
+        diffs = patch_utils.compute_diff(old, new)
+        assert diffs == [{"path": ["abilities", 0, "it's"], "new_value": {"damage": 5}}]
+
+    def test_equal_documents_skip_the_walk(self):
+        old = {"last_modified": "2024-01-01", "stats": {"health": 100}, "tags": ["a"]}
+        new = {"stats": {"health": 100}, "tags": ["a"], "last_modified": "2026-01-01"}
+        with patch("patch_utils._walk_diff") as walk:
+            assert patch_utils.compute_diff(old, new) == []
+        walk.assert_not_called()
+
     def test_type_change_int_to_string(self):
         old = {"level": 1}
         new = {"level": "one"}
@@ -139,6 +167,21 @@ class TestComputeDiff:
         data = {f"key_{i}": i * 10 for i in range(100)}
         assert patch_utils.compute_diff(data, data) == []
 
+    def test_numeric_type_change_is_reported(self):
+        """1 and 1.0 compare equal in Python but are a type change, as in DeepDiff."""
+        diffs = patch_utils.compute_diff({"stats": {"range": 1}}, {"stats": {"range": 1.0}})
+        assert diffs == [{"path": ["stats", "range"], "old_value": 1, "new_value": 1.0}]
+
+    def test_reordered_list_is_not_a_change(self):
+        assert patch_utils.compute_diff({"tags": ["a", "b"]}, {"tags": ["b", "a"]}) == []
+
+    def test_mostly_replaced_dict_is_one_change(self):
+        """Dicts sharing under a third of their keys are reported as a whole replacement."""
+        old = {"mechanics": {"stun": 1, "slow": 2, "burn": 3}}
+        new = {"mechanics": {"stun": 1, "root": 2, "freeze": 3}}
+        diffs = patch_utils.compute_diff(old, new)
+        assert diffs == [{"path": ["mechanics"], "old_value": old["mechanics"], "new_value": new["mechanics"]}]
+
 
 # ---------------------------------------------------------------------------
 # get_file_content_at_commit — subprocess mock
@@ -173,6 +216,99 @@ class TestGetFileContentAtCommit:
         assert "show" in args
         assert "deadbeef:data/units/skeleton.json" in args
 
+    @patch("subprocess.run")
+    @patch("subprocess.Popen")
+    def test_batch_reader_serves_blobs_from_one_process(self, mock_popen, mock_run):
+        """Inside batch_reader(), reads should go through one cat-file --batch process, not git show."""
+        body = b'{"health": 100}'
+        proc = mock_popen.return_value
+        proc.stdout = io.BytesIO(b"1111 blob %d\n%s\nc0ffee:data/units/gone.json missing\n" % (len(body), body))
+
+        with patch_utils.batch_reader():
+            assert patch_utils.get_file_content_at_commit("data/units/ogre.json", "c0ffee~1") == {"health": 100}
+            assert patch_utils.get_file_content_at_commit("data/units/gone.json", "c0ffee") is None
+
+        assert mock_popen.call_args[0][0] == ["git", "cat-file", "--batch"]
+        written = b"".join(c.args[0] for c in proc.stdin.write.call_args_list)
+        assert written == b"c0ffee~1:data/units/ogre.json\nc0ffee:data/units/gone.json\n"
+        mock_run.assert_not_called()
+        proc.wait.assert_called_once()
+
+    @patch("threading.Thread")
+    @patch("subprocess.Popen")
+    def test_single_reads_skip_the_feeder_thread(self, mock_popen, mock_thread):
+        """One-object reads (plain or memoized) are written inline, without starting a thread."""
+        body = b'{"health": 100}'
+        proc = mock_popen.return_value
+        proc.stdout = io.BytesIO(b"1111 blob %d\n%s\n" % (len(body), body) * 2)
+
+        with patch_utils.BatchCatFile() as reader:
+            assert reader.get_object("1111") == {"health": 100}
+        with patch_utils.BatchCatFile(memoize=True) as reader:
+            assert reader.get_many(["1111"]) == [{"health": 100}]
+
+        mock_thread.assert_not_called()
+
+    @patch("subprocess.Popen")
+    def test_memoized_reader_fetches_each_object_once(self, mock_popen):
+        body = b'{"health": 100}'
+        proc = mock_popen.return_value
+        proc.stdout = io.BytesIO(b"1111 blob %d\n%s\n" % (len(body), body))
+
+        with patch_utils.batch_reader(memoize=True):
+            first = patch_utils.get_file_content_at_commit("data/units/ogre.json", "c0ffee")
+            second = patch_utils.get_file_content_at_commit("data/units/ogre.json", "c0ffee")
+
+        assert first == {"health": 100}
+        assert second is first
+        assert proc.stdin.write.call_count == 1
+
+    @patch("subprocess.Popen")
+    def test_memoized_reader_shares_documents_by_blob(self, mock_popen):
+        """The same blob reached through two revisions is parsed only once."""
+        body = b'{"health": 100}'
+        proc = mock_popen.return_value
+        proc.stdout = io.BytesIO(b"1111 blob %d\n%s\n" % (len(body), body) * 2)
+
+        with patch_utils.batch_reader(memoize=True):
+            docs = patch_utils.get_files_at_commit(["data/units/ogre.json"], "v2~1")
+            docs += patch_utils.get_files_at_commit(["data/units/ogre.json"], "v2")
+
+        assert docs[0] == {"health": 100}
+        assert docs[1] is docs[0]
+
+    @patch("subprocess.Popen")
+    def test_get_files_at_commit_pipelines_requests(self, mock_popen):
+        """All names are written in one batch and the replies matched up in order."""
+        a, b = b'{"hp": 1}', b'{"hp": 2}'
+        proc = mock_popen.return_value
+        proc.stdout = io.BytesIO(b"1 blob %d\n%s\nc:data/x.json missing\n2 blob %d\n%s\n" % (len(a), a, len(b), b))
+
+        with patch_utils.batch_reader():
+            docs = patch_utils.get_files_at_commit(["data/a.json", "data/x.json", "data/b.json"], "c")
+
+        assert docs == [{"hp": 1}, None, {"hp": 2}]
+        proc.stdin.write.assert_called_once_with(b"c:data/a.json\nc:data/x.json\nc:data/b.json\n")
+
+    @patch("subprocess.Popen")
+    def test_list_files_walks_trees(self, mock_popen):
+        """list_files_at_commit should walk raw tree objects, recursing into subdirectories."""
+        sub_id, blob_id = bytes(range(20)), bytes(20)
+        root = b"100644 ogre.json\0" + blob_id + b"40000 elite\0" + sub_id
+        sub = b"100644 boss.json\0" + blob_id
+        proc = mock_popen.return_value
+        proc.stdout = io.BytesIO(
+            b"%s tree %d\n%s\n%s tree %d\n%s\n" % (b"a" * 40, len(root), root, sub_id.hex().encode(), len(sub), sub)
+        )
+
+        assert patch_utils.list_files_at_commit("data/units", "c0ffee") is None
+        with patch_utils.batch_reader():
+            files = patch_utils.list_files_at_commit("data/units", "c0ffee")
+
+        assert files == ["data/units/elite/boss.json", "data/units/ogre.json"]
+        written = b"".join(c.args[0] for c in proc.stdin.write.call_args_list)
+        assert written == b"c0ffee:data/units\n" + sub_id.hex().encode() + b"\n"
+
 
 # ---------------------------------------------------------------------------
 # load_json / save_json — filesystem
@@ -212,3 +348,12 @@ class TestLoadSaveJson:
         raw = open(out, encoding="utf-8").read()
         # indent=2 means second line starts with two spaces
         assert "  " in raw
+
+    def test_save_skips_unchanged_file(self, tmp_path):
+        out = tmp_path / "out.json"
+        patch_utils.save_json(str(out), {"a": 1})
+        os.utime(out, ns=(0, 0))
+        patch_utils.save_json(str(out), {"a": 1})
+        assert out.stat().st_mtime_ns == 0
+        patch_utils.save_json(str(out), {"a": 2})
+        assert json.loads(out.read_text(encoding="utf-8")) == {"a": 2}